@@ -0,0 +1,245 @@
+import asyncio
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Кодировки в порядке предпочтения при равном q (недоступные пропускаются)
+ENCODINGS = tuple(
+    name for name, available in (
+        ("zstd", zstandard is not None),
+        ("br", brotli is not None),
+        ("gzip", True),
+    )
+    if available
+)
+
+# Типы содержимого, которые имеет смысл сжимать
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """
+    Выбирает кодировку по заголовку Accept-Encoding с учётом q-значений.
+
+    Возвращает:
+        Optional[str]: Название кодировки или None, если сжимать не нужно.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name] = q
+
+    candidates = [
+        (accepted.get(name, accepted.get("*", 0.0)), -idx, name)
+        for idx, name in enumerate(ENCODINGS)
+    ]
+    q, _, name = max(candidates)
+    return name if q > 0 else None
+
+
+def add_encoding(etag: str, encoding: str) -> str:
+    """ETag сжатого представления: суффикс кодировки внутри кавычек"""
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else etag
+
+
+def strip_encoding(etag: str) -> str:
+    """
+    Убирает из ETag суффикс кодировки, добавленный CompressionMiddleware (обратное add_encoding).
+    Приложение сравнивает If-None-Match со своим ETag без суффикса.
+    """
+    for name in ENCODINGS:
+        suffix = f'-{name}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+class _Compressor:
+    """Потоковый компрессор с единым интерфейсом для gzip, br и zstd"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int, zstd_level: int):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool = False) -> bytes:
+        if self.encoding == "br":
+            chunk = self._obj.process(data)
+            return chunk + (self._obj.finish() if final else self._obj.flush())
+        chunk = self._obj.compress(data)
+        if final:
+            return chunk + self._obj.flush()
+        # Сбрасываем накопленное, чтобы клиент получал данные по мере генерации
+        if self.encoding == "zstd":
+            return chunk + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return chunk + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI-middleware сжатия ответов (zstd, br, gzip) по Accept-Encoding.
+
+    Обычные ответы сжимаются целиком, если они не меньше minimum_size.
+    Потоковые ответы (file, ndjson) сжимаются блоками по мере накопления chunk_size байт.
+    Само сжатие выполняется в потоке, чтобы не блокировать event loop.
+
+    Ответ 304 не сжимается, но получает тот же ETag с суффиксом кодировки и
+    Vary: Accept-Encoding, что и сжатый ответ 200, который он подтверждает.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        chunk_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3
+    ):
+        """
+        Аргументы:
+            app (ASGIApp): Приложение.
+            minimum_size (int): Минимальный размер обычного ответа для сжатия (байт).
+            chunk_size (int): Размер блока потокового ответа, сжимаемого за раз (байт).
+            gzip_level (int): Уровень сжатия gzip.
+            brotli_quality (int): Качество brotli.
+            zstd_level (int): Уровень сжатия zstd.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.chunk_size = chunk_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = negotiate(headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send, headers.get("if-none-match", ""))
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send, if_none_match: str = ""):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.if_none_match = if_none_match
+        self.start_message: Optional[Message] = None
+        self.mode: Optional[str] = None   # identity или compress
+        self.compressor: Optional[_Compressor] = None
+        self.buffer = bytearray()
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if self.start_message["status"] == 304:
+                self._revalidated(headers)
+            if not self._compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self.mode = "identity"
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.mode = "compress"
+            self.compressor = _Compressor(
+                self.encoding,
+                self.middleware.gzip_level,
+                self.middleware.brotli_quality,
+                self.middleware.zstd_level
+            )
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # Сжатое представление - другой набор байт, поэтому и ETag другой
+            etag = headers.get("etag")
+            if etag:
+                headers["ETag"] = add_encoding(etag, self.encoding)
+
+            if not more_body:
+                data = await asyncio.to_thread(self.compressor.compress, body, True)
+                headers["Content-Length"] = str(len(data))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": data})
+                return
+
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send(self.start_message)
+
+        if self.mode == "identity":
+            await self._send(message)
+            return
+
+        self.buffer += body
+        if len(self.buffer) < self.middleware.chunk_size and more_body:
+            return
+
+        data = await asyncio.to_thread(self.compressor.compress, bytes(self.buffer), not more_body)
+        self.buffer.clear()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _revalidated(self, headers: MutableHeaders) -> None:
+        """
+        304 должен нести тот же валидатор, что и подтверждаемый ответ 200. Клиент,
+        приславший ETag без суффикса, хранит несжатое представление (маленький ответ) -
+        его ETag не меняется; иначе ETag получает суффикс согласованной кодировки.
+        """
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if not etag:
+            return
+        tags = [tag.strip().removeprefix("W/") for tag in self.if_none_match.split(",")]
+        if etag not in tags:
+            headers["ETag"] = add_encoding(etag, self.encoding)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        status = self.start_message["status"]
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -1,28 +1,77 @@
-from fastapi import FastAPI, HTTPException, Query
-from common.database import initialize_databases, Internships
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from common.database import (
+    canonical_filters, database_pool, initialize_databases, Internships, INTERNSHIP_COLUMNS, normalize_columns
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.openapi.utils import get_openapi
-import tempfile
-import json
+from contextlib import asynccontextmanager
 import asyncio
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Optional
 
 from common.logger import get_logger
-from common import TrudVsemParser, HHParser
+from common.columnar import COLUMNAR_FORMATS, ensure_available as ensure_columnar_available, iter_columnar
+from common.jobs import crawl_jobs
+from common.search_index import refresh_search_index
+from common.serialization import dumps, row_to_item
 
-from api.models import InternshipFilters, InternshipKeywords, get_clean_filters
+from api.compression import CompressionMiddleware, strip_encoding
+from api.models import BatchRequest, InternshipFilters, InternshipKeywords, get_clean_filters
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Общий пул соединений на всё время работы приложения
+    await database_pool.open()
+
+    # Построение поискового индекса (если включён режим DB_KEYWORD_SEARCH=index)
+    try:
+        tables = await initialize_databases()
+        await refresh_search_index(tables[1])
+    except Exception as e:
+        logger.error(f"Не удалось построить поисковый индекс: {e}")
+
+    yield
+
+    await database_pool.close()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ через общий сериализатор (orjson, если установлен)"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+# Сжатие ответов по Accept-Encoding (zstd, br, gzip)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 logger = get_logger(__name__)
 
 
+# Максимум записей на страницу для JSON-ответа; потоковые форматы не держат выборку в памяти
+MAX_PAGE_LIMIT = 1000
+MAX_STREAM_LIMIT = 100000
+
+# Форматы ответа, которые отдаются потоком
+STREAM_FORMATS = ('file', 'ndjson')
+
+# Максимум запросов в одном пакете и одновременно выполняемых запросов пакета
+MAX_BATCH_QUERIES = 20
+MAX_BATCH_CONCURRENCY = 4
+
+
 @app.get("/internships/filters")
 async def get_internships(
-    response_format: Optional[str] = Query('json', description="Формат ответа: json или file"),
-    limit: int = Query(100, ge=1, le=1000, description="Количество записей на странице"),
+    request: Request,
+    response_format: Optional[str] = Query('json', description="Формат ответа: json, file или ndjson (file и ndjson отдаются потоком)"),
+    limit: int = Query(100, ge=1, le=MAX_STREAM_LIMIT, description="Количество записей на странице (до 1000 для json)"),
     offset: int = Query(0, ge=0, description="Смещение (пропуск записей)"),
+    after_id: Optional[int] = Query(None, ge=0, description="Курсор: вернуть записи с id больше указанного (вместо offset для глубоких страниц)"),
+    fields: Optional[str] = Query(None, description="Поля ответа через запятую (например, 'title,link'); id возвращается всегда"),
 
     profession: Optional[str] = Query(None, description="Фильтр по профессии"),
     company_name: Optional[str] = Query(None, description="Фильтр по названию компании"),
@@ -49,21 +98,29 @@ async def get_internships(
         logger.info(filters)
 
         return await build_response(
+            request=request,
             response_format=response_format,
             filters=filters,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_id=after_id,
+            columns=parse_fields(fields)
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, detail=str(e))
 
 
 @app.get("/internships/keywords")
 async def get_internships_by_keywords(
-    response_format: Optional[str] = Query('json', description="Формат ответа: json или file"),
-    limit: int = Query(100, ge=1, le=1000, description="Количество записей на странице"),
+    request: Request,
+    response_format: Optional[str] = Query('json', description="Формат ответа: json, file или ndjson (file и ndjson отдаются потоком)"),
+    limit: int = Query(100, ge=1, le=MAX_STREAM_LIMIT, description="Количество записей на странице (до 1000 для json)"),
     offset: int = Query(0, ge=0, description="Смещение (пропуск записей)"),
+    after_id: Optional[int] = Query(None, ge=0, description="Курсор: вернуть записи с id больше указанного (вместо offset для глубоких страниц)"),
+    fields: Optional[str] = Query(None, description="Поля ответа через запятую (например, 'title,link'); id возвращается всегда"),
 
     keywords: str = Query(description="Перечислите ключевые слова через запятую, перед словами-исключениями поставьте '-' (например, 'python, -java')"),
     salary_from: Optional[int] = Query(None, description="Минимальная зарплата"),
@@ -82,98 +139,353 @@ async def get_internships_by_keywords(
         logger.info(filters)
 
         return await build_response(
+            request=request,
             response_format=response_format,
             filters=filters,
             limit=limit,
-            offset=offset
+            offset=offset,
+            after_id=after_id,
+            columns=parse_fields(fields)
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, detail=str(e))
 
 
+def parse_fields(fields: Optional[str]) -> tuple[str, ...]:
+    """Разбирает параметр fields в список колонок выборки (400 при неизвестном поле)"""
+    try:
+        return normalize_columns(fields.split(",") if fields else None)
+    except ValueError as e:
+        raise HTTPException(400, detail=str(e))
+
+
+def make_validators(version: int, updated_at: float, query_key: str) -> dict:
+    """
+    Заголовки-валидаторы ответа: сильный ETag от версии данных и нормализованного
+    запроса, Last-Modified - время последнего изменения данных.
+    """
+    key = f"{version}:{query_key}"
+    etag = '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if updated_at:
+        headers["Last-Modified"] = formatdate(updated_at, usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, validators: dict, updated_at: float) -> bool:
+    """Проверяет If-None-Match (приоритетно) и If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [strip_encoding(tag.strip().removeprefix("W/")) for tag in if_none_match.split(",")]
+        return "*" in tags or validators["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated_at:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified передаётся с точностью до секунды
+        return int(updated_at) <= since
+    return False
+
+
 async def build_response(
+    request: Request,
     response_format: str,
     filters: dict,
     limit: int,
-    offset: int
+    offset: int,
+    after_id: Optional[int] = None,
+    columns: tuple[str, ...] = INTERNSHIP_COLUMNS
 ):
     tables = await initialize_databases()
     internships_table: Internships = tables[1]
-    if filters.get("keywords", None):
-        result = await internships_table.select_internship_data_by_keywords(**filters)
-    else:
-        result = await internships_table.select_internship_data(**filters)
-
-    # Формируем данные
-    headers = [
-        'id', 'title', 'profession', 'company_name', 'salary_from',
-        'salary_to', 'source_name', 'link',
-        'description', 'created_at', 'employment_types'
-    ]
-
-    data = []
-    for row in result:
-        item = {
-            header: str(value) if value is not None else ''
-            for header, value in zip(headers, row)
-        }
-        # Конвертация числовых полей
-        for numeric_field in ['id', 'salary_from', 'salary_to']:
-            if item[numeric_field].isdigit():
-                item[numeric_field] = int(item[numeric_field])
 
-        data.append(item)
+    # Пока данные не менялись, одинаковый запрос даёт тот же ответ - отвечаем 304 без выборки
+    version, updated_at = await internships_table.dataset_state()
+    validators = make_validators(
+        version, updated_at,
+        f"{request.url.path}:{response_format}:{limit}:{offset}:{after_id}:"
+        f"{','.join(columns)}:{canonical_filters(filters)}"
+    )
+    if is_not_modified(request, validators, updated_at):
+        return Response(status_code=304, headers=validators)
 
-    total = len(data)
+    if response_format in STREAM_FORMATS:
+        return await build_stream_response(
+            internships_table, response_format, filters, limit, offset, after_id, columns, validators, version
+        )
 
-    response_data = {
+    if limit > MAX_PAGE_LIMIT:
+        raise HTTPException(
+            400, detail=f"limit больше {MAX_PAGE_LIMIT} доступен только для форматов {', '.join(STREAM_FORMATS)}"
+        )
+
+    # Возвращаем готовый ответ, минуя jsonable_encoder: данные уже приведены к JSON-типам
+    page = await fetch_page(internships_table, filters, limit, offset, after_id, columns)
+    return FastJSONResponse(page, headers=validators)
+
+
+async def fetch_page(
+    internships_table: Internships,
+    filters: dict,
+    limit: int,
+    offset: int,
+    after_id: Optional[int],
+    columns: tuple[str, ...]
+) -> dict:
+    """Страница выборки с пагинацией в формате ответа json"""
+    # Запрашиваем на одну запись больше, чтобы точно знать, есть ли следующая страница
+    page = {"limit": limit + 1, "offset": offset, "after_id": after_id, "columns": columns}
+    if filters.get("keywords", None):
+        result, total = await asyncio.gather(
+            internships_table.select_internship_data_by_keywords(**page, **filters),
+            internships_table.count_internship_data_by_keywords(**filters)
+        )
+    else:
+        result, total = await asyncio.gather(
+            internships_table.select_internship_data(**page, **filters),
+            internships_table.count_internship_data(**filters)
+        )
+
+    has_more = len(result) > limit
+    data = [row_to_item(row, columns) for row in result[:limit]]
+    return {
         "data": data,
         "pagination": {
             "total": total,
             "limit": limit,
             "offset": offset,
-            "has_more": (offset + limit) < total
+            "has_more": has_more,
+            "next_after_id": data[-1]["id"] if has_more and data else None
         }
     }
 
-    # Возвращаем в нужном формате
-    if response_format == 'file':
-        with tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.json',
-            delete=False,
-            encoding='utf-8'
-        ) as tmpfile:
-            json.dump(response_data, tmpfile, ensure_ascii=False, indent=4)
-            tmpfile_path = tmpfile.name
-
-        return FileResponse(
-            tmpfile_path,
-            filename="internships.json",
-            media_type='application/json'
-        )
+
+async def build_stream_response(
+    internships_table: Internships,
+    response_format: str,
+    filters: dict,
+    limit: int,
+    offset: int,
+    after_id: Optional[int],
+    columns: tuple[str, ...],
+    headers: dict,
+    version: int
+) -> StreamingResponse:
+    """
+    Отдаёт выборку потоком по мере чтения серверным курсором, без временных файлов.
+
+    ndjson - по одному JSON-объекту стажировки на строку.
+    file - JSON-файл той же структуры, что и ответ json (data, затем pagination).
+    """
+    if filters.get("keywords", None):
+        total = await internships_table.count_internship_data_by_keywords(**filters)
     else:
-        return response_data
+        total = await internships_table.count_internship_data(**filters)
+
+    # Лишняя запись показывает, есть ли продолжение; сама она не отдаётся
+    rows = internships_table.stream_internship_data(
+        limit=limit + 1, offset=offset, after_id=after_id, columns=columns, min_version=version, **filters
+    )
 
+    async def ndjson():
+        count = 0
+        try:
+            async for row in rows:
+                count += 1
+                if count > limit:
+                    break
+                yield dumps(row_to_item(row, columns)) + b"\n"
+        finally:
+            # Закрываем курсор и возвращаем соединение сразу, а не при сборке мусора
+            await rows.aclose()
 
-@app.put("/internships/update_db")
-async def update_db():
-    trudvsem_parser = TrudVsemParser()
-    hh_parser = HHParser()
-    logger.info("Updating DB")
+    async def json_file():
+        yield b'{"data": ['
+        count = 0
+        last_id = None
+        try:
+            async for row in rows:
+                count += 1
+                if count > limit:
+                    break
+                item = row_to_item(row, columns)
+                last_id = item["id"]
+                yield (b"," if count > 1 else b"") + b"\n" + dumps(item)
+        finally:
+            await rows.aclose()
+        has_more = count > limit
+        pagination = {
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "has_more": has_more,
+            "next_after_id": last_id if has_more else None
+        }
+        yield b'\n], "pagination": ' + dumps(pagination) + b"}\n"
+
+    if response_format == 'ndjson':
+        return StreamingResponse(
+            ndjson(),
+            media_type="application/x-ndjson",
+            headers={**headers, "X-Total-Count": str(total)}
+        )
+    return StreamingResponse(
+        json_file(),
+        media_type="application/json",
+        headers={**headers, "Content-Disposition": 'attachment; filename="internships.json"'}
+    )
+
+
+@app.get("/internships/export")
+async def export_internships(
+    request: Request,
+    file_format: str = Query('parquet', alias="format", description="Формат выгрузки: parquet или arrow (Arrow IPC stream)"),
+    keywords: Optional[str] = Query(None, description="Ключевые слова через запятую (как в /internships/keywords); с ними применяются только фильтры зарплаты и занятости"),
+    fields: Optional[str] = Query(None, description="Колонки выгрузки через запятую; id выгружается всегда"),
+
+    profession: Optional[str] = Query(None, description="Фильтр по профессии"),
+    company_name: Optional[str] = Query(None, description="Фильтр по названию компании"),
+    salary_from: Optional[int] = Query(None, description="Минимальная зарплата"),
+    salary_to: Optional[int] = Query(None, description="Максимальная зарплата"),
+    source_name: Optional[str] = Query(None, description="Название источника"),
+    employment_type: Optional[str] = Query(None, description="Тип занятости"),
+    description: Optional[str] = Query(None, description="Описание стажировки")
+):
+    if file_format not in COLUMNAR_FORMATS:
+        raise HTTPException(400, detail=f"Неизвестный формат: {file_format}")
     try:
-        await asyncio.gather(
-            trudvsem_parser.get_internships(),
-            hh_parser.get_internships()
+        ensure_columnar_available()
+    except RuntimeError as e:
+        raise HTTPException(501, detail=str(e))
+
+    filters = get_clean_filters(
+        InternshipFilters(
+            profession=profession,
+            company_name=company_name,
+            salary_from=salary_from,
+            salary_to=salary_to,
+            source_name=source_name,
+            employment_type=employment_type,
+            description=description
         )
-        return {"status": "success", "updated": True}
-    except Exception as e:
-        logger.error(f"Update failed: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Database update failed: {str(e)}"
+    )
+    if keywords:
+        filters["keywords"] = keywords.split(",")
+    columns = parse_fields(fields)
+    logger.info(filters)
+
+    tables = await initialize_databases()
+    internships_table: Internships = tables[1]
+
+    version, updated_at = await internships_table.dataset_state()
+    validators = make_validators(
+        version, updated_at,
+        f"{request.url.path}:{file_format}:{','.join(columns)}:{canonical_filters(filters)}"
+    )
+    if is_not_modified(request, validators, updated_at):
+        return Response(status_code=304, headers=validators)
+
+    rows = internships_table.stream_internship_data(
+        limit=None, columns=columns, min_version=version, **filters
+    )
+
+    async def content():
+        try:
+            async for chunk in iter_columnar(rows, file_format, columns):
+                yield chunk
+        finally:
+            await rows.aclose()
+
+    extension, media_type = COLUMNAR_FORMATS[file_format]
+    return StreamingResponse(
+        content(),
+        media_type=media_type,
+        headers={**validators, "Content-Disposition": f'attachment; filename="internships.{extension}"'}
+    )
+
+
+@app.post("/internships/batch")
+async def get_internships_batch(batch: BatchRequest):
+    """
+    Выполняет несколько запросов (фильтры или keywords) за один вызов на общем пуле.
+    Одинаковые запросы выполняются один раз; результаты идут в порядке запросов.
+    """
+    if not batch.queries:
+        raise HTTPException(400, detail="Пустой пакет запросов")
+    if len(batch.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(400, detail=f"В пакете больше {MAX_BATCH_QUERIES} запросов")
+
+    # Разбираем все запросы заранее, чтобы ошибка в одном не оставила остальные выполняться
+    keys = []
+    unique = {}
+    for query in batch.queries:
+        if query.limit > MAX_PAGE_LIMIT:
+            raise HTTPException(400, detail=f"limit больше {MAX_PAGE_LIMIT} недоступен в пакете")
+        filters = query.filters()
+        columns = parse_fields(query.fields)
+        key = (
+            f"{query.limit}:{query.offset}:{query.after_id}:"
+            f"{','.join(columns)}:{canonical_filters(filters)}"
         )
+        keys.append(key)
+        unique.setdefault(key, (filters, query.limit, query.offset, query.after_id, columns))
+
+    try:
+        tables = await initialize_databases()
+        internships_table: Internships = tables[1]
+
+        semaphore = asyncio.Semaphore(min(batch.concurrency or MAX_BATCH_CONCURRENCY, MAX_BATCH_CONCURRENCY))
+
+        async def run(filters, limit, offset, after_id, columns):
+            async with semaphore:
+                return await fetch_page(internships_table, filters, limit, offset, after_id, columns)
+
+        pages = await asyncio.gather(*(run(*args) for args in unique.values()))
+        results = dict(zip(unique, pages))
+        logger.info(f"Пакет: {len(keys)} запросов, выполнено {len(unique)}")
+
+        return FastJSONResponse({"results": [results[key] for key in keys]})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, detail=str(e))
+
+
+@app.put("/internships/update_db", status_code=202)
+async def update_db():
+    # Сбор идёт в фоне; повторный запуск во время сбора возвращает ту же задачу
+    job = crawl_jobs.start()
+    logger.info(f"Updating DB, job {job.id}")
+    return {"status": "accepted", "job_id": job.id, "job": job.as_dict()}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, detail="Задача не найдена")
+    return job.as_dict()
+
+
+@app.get("/health")
+async def health():
+    database_ok = await database_pool.health_check()
+    response_data = {
+        "status": "ok" if database_ok else "degraded",
+        "database": database_ok,
+        "pool": database_pool.stats(),
+        "query_cache": Internships.query_cache.stats() if Internships.query_cache else None
+    }
+    if not database_ok:
+        return FastJSONResponse(response_data, status_code=503)
+    return response_data
 
 
 def custom_openapi():
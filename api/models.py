@@ -1,5 +1,5 @@
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
 
 
 # Модель для фильтров (можно вынести в отдельный файл)
@@ -20,6 +20,30 @@ class InternshipKeywords(BaseModel):
     employment_type: Optional[str] = None
 
 
+class BatchQuery(InternshipFilters):
+    """Один запрос пакета: фильтры (или keywords с фильтрами зарплаты и занятости) и страница"""
+    keywords: Optional[str] = None
+    limit: int = Field(100, ge=1)
+    offset: int = Field(0, ge=0)
+    after_id: Optional[int] = Field(None, ge=0)
+    fields: Optional[str] = None
+
+    def filters(self) -> Dict[str, Any]:
+        if self.keywords:
+            return get_clean_filters(InternshipKeywords(
+                keywords=self.keywords,
+                salary_from=self.salary_from,
+                salary_to=self.salary_to,
+                employment_type=self.employment_type
+            ))
+        return get_clean_filters(InternshipFilters(**self.model_dump(include=set(InternshipFilters.model_fields))))
+
+
+class BatchRequest(BaseModel):
+    queries: List[BatchQuery]
+    concurrency: Optional[int] = Field(None, ge=1, description="Сколько запросов пакета выполнять одновременно")
+
+
 def get_clean_filters(self) -> Dict[str, Any]:
     filters = {}
     for key, value in self.__dict__.items():
@@ -13,6 +13,10 @@ from aiogram.client.default import DefaultBotProperties
 # Импорты конфигурации
 from common.config import load_config
 
+# Импорты поискового индекса
+from common.database import database_pool, initialize_databases
+from common.search_index import refresh_search_index
+
 # Логгер для работы с логами
 logger = get_logger(__name__)
 
@@ -35,9 +39,18 @@ async def main():
     dp.include_router(admin_handlers.router)
     dp.include_router(filters_handlers.router)
 
-    # Удаление вебхуков и запуск long-polling
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    # Общий пул соединений на всё время работы бота
+    await database_pool.open()
+    try:
+        # Построение поискового индекса (если включён режим DB_KEYWORD_SEARCH=index)
+        tables = await initialize_databases()
+        await refresh_search_index(tables[1])
+
+        # Удаление вебхуков и запуск long-polling
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot)
+    finally:
+        await database_pool.close()
 
 
 if __name__ == "__main__":
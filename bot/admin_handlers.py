@@ -1,14 +1,11 @@
-import asyncio
-
 from aiogram import Router, F
 from aiogram.types import Message
 
 from bot.lexicon import LEXICON, LEXICON_COMMANDS
 import bot.menu_kb as kb
 from bot.menu_handlers import add_to_history
-from common import TrudVsemParser, HHParser
 from common.logger import get_logger
-from common.database import initialize_databases, Internships
+from common.jobs import crawl_jobs
 
 
 # Инициализация роутера
@@ -35,21 +32,14 @@ async def add_admin(message: Message):
 # Обработка кнопки "Обновить БД"
 @router.message(F.text == LEXICON_COMMANDS["update_db"])
 async def update_db(message: Message):
-    tables = await initialize_databases()
-    internships_table: Internships = tables[1]
-
-    trudvsem_parser: TrudVsemParser = TrudVsemParser()
-    hh_parser: HHParser = HHParser()
-
     await message.answer(text=LEXICON["processing"])
     logger.info("Updating DB")
-    try:
-        await asyncio.gather(
-            trudvsem_parser.get_internships(),
-            hh_parser.get_internships()
-        )
-        await internships_table.update_internships()
+
+    # Общая с API логика: один сбор на процесс, источники защищены блокировкой в БД
+    job = await crawl_jobs.start(purge_days=7).wait()
+    logger.info(f"Задача сбора {job.id}: {job.as_dict()}")
+    if job.status == "success":
         await message.answer(text=LEXICON["db_succeed_update"])
-    except Exception as e:
-        logger.error(str(e))
+    else:
+        logger.error(job.error)
         await message.answer(text=LEXICON["db_failed_update"])
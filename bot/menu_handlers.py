@@ -1,4 +1,4 @@
-import json
+import asyncio
 import tempfile
 import os
 import csv
@@ -15,6 +15,8 @@ import bot.menu_kb as kb
 from bot.menu_kb import sites_keyboard, employment_types_keyboard
 
 from common.database import initialize_databases, Internships, EmploymentTypes
+from common.columnar import write_columnar_file
+from common.serialization import dumps, row_to_item
 
 from common.logger import get_logger
 
@@ -135,11 +137,13 @@ def format_txt(data: list) -> str:
     """Форматирует данные в текстовый формат"""
     result = []
     for item in data:
+        salary_from = item['salary_from'] if item['salary_from'] is not None else ''
+        salary_to = item['salary_to'] if item['salary_to'] is not None else ''
         txt_entry = [
             f"ID: {item['id']}",
             f"Должность: {item['profession']}",
             f"Компания: {item['company_name']}",
-            f"Зарплата: {item['salary_from']}-{item['salary_to']}",
+            f"Зарплата: {salary_from}-{salary_to}",
             f"Источник: {item['source_name']}",
             f"Тип занятости: {item['employment_types']}",
             f"Ссылка: {item['link']}",
@@ -152,8 +156,8 @@ def format_txt(data: list) -> str:
 
 def write_json(data: list, file_path: str):
     """Записывает данные в JSON файл"""
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    with open(file_path, 'wb') as f:
+        f.write(dumps(data, indent=True))
 
 
 def write_csv(data: list, file_path: str):
@@ -174,7 +178,7 @@ def write_txt(data: list, file_path: str):
         f.write(format_txt(data))
 
 
-@router.message(F.text.in_({"json", "csv", "txt"}))
+@router.message(F.text.in_({"json", "csv", "txt", "parquet"}))
 async def process_export_file(message: Message, state: FSMContext):
     await message.answer(text=LEXICON["processing"])
 
@@ -197,26 +201,6 @@ async def process_export_file(message: Message, state: FSMContext):
             await state.clear()
             return
 
-        # Формируем структуру данных
-        headers = [
-            'id', 'title', 'profession', 'company_name', 'salary_from',
-            'salary_to', 'source_name', 'link',
-            'description', 'created_at', 'employment_types'
-        ]
-
-        json_data = []
-        for row in result:
-            item = {
-                header: str(value) if value is not None else ''
-                for header, value in zip(headers, row)
-            }
-            # Конвертация числовых полей
-            for numeric_field in ['id', 'salary_from', 'salary_to']:
-                if item[numeric_field].isdigit():
-                    item[numeric_field] = int(item[numeric_field])
-
-            json_data.append(item)
-
         # Создаем временный файл нужного формата
         with tempfile.NamedTemporaryFile(
             mode='w',
@@ -228,12 +212,19 @@ async def process_export_file(message: Message, state: FSMContext):
             tmpfile_path = tmpfile.name
 
         # Записываем данные в файл в зависимости от формата
-        if file_type == "json":
-            write_json(json_data, tmpfile_path)
-        elif file_type == "csv":
-            write_csv(json_data, tmpfile_path)
-        elif file_type == "txt":
-            write_txt(json_data, tmpfile_path)
+        if file_type == "parquet":
+            # Колонки с типами БД пишутся прямо из строк выборки
+            await asyncio.to_thread(write_columnar_file, result, tmpfile_path, "parquet")
+        else:
+            # Формируем структуру данных (те же типы, что и в ответах API)
+            json_data = [row_to_item(row) for row in result]
+
+            if file_type == "json":
+                write_json(json_data, tmpfile_path)
+            elif file_type == "csv":
+                write_csv(json_data, tmpfile_path)
+            elif file_type == "txt":
+                write_txt(json_data, tmpfile_path)
 
         # Отправляем файл пользователю
         document = FSInputFile(
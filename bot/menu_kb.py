@@ -82,7 +82,8 @@ ExportFileMenu = ReplyKeyboardMarkup(
         [
             KeyboardButton(text="csv"),
             KeyboardButton(text="txt"),
-            KeyboardButton(text="json")
+            KeyboardButton(text="json"),
+            KeyboardButton(text="parquet")
         ],
         [
             KeyboardButton(text=LEXICON_COMMANDS["back"]),
@@ -0,0 +1,161 @@
+import asyncio
+from typing import AsyncIterator, Iterable, Sequence
+
+from common.database import INTERNSHIP_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Форматы выгрузки: расширение файла и MIME-тип
+COLUMNAR_FORMATS = {
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "arrow": ("arrows", "application/vnd.apache.arrow.stream"),
+}
+
+
+def _column_types() -> dict:
+    """Типы колонок INTERNSHIP_COLUMNS в Arrow"""
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return {
+        'id': pa.int32(),
+        'title': pa.string(),
+        'profession': pa.string(),
+        'company_name': pa.string(),
+        'salary_from': pa.decimal128(10, 2),
+        'salary_to': pa.decimal128(10, 2),
+        'source_name': dictionary,
+        'link': pa.string(),
+        'description': pa.string(),
+        'created_at': pa.timestamp('s'),
+        'employment_types': dictionary,
+    }
+
+
+def ensure_available() -> None:
+    if pa is None:
+        raise RuntimeError("Для выгрузки Parquet/Arrow установите пакет pyarrow")
+
+
+def internship_schema(columns: Sequence[str] = INTERNSHIP_COLUMNS) -> "pa.Schema":
+    """Схема Arrow для строк с указанными колонками"""
+    ensure_available()
+    types = _column_types()
+    return pa.schema([pa.field(column, types[column]) for column in columns])
+
+
+def rows_to_batch(rows: Sequence[tuple], schema: "pa.Schema") -> "pa.RecordBatch":
+    """
+    Строит RecordBatch из строк выборки. Источник и типы занятости
+    хранятся словарём (повторяющиеся значения - индексами).
+    """
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Файлоподобный приёмник: накапливает записанные байты до выдачи клиенту"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _open_writer(sink, file_format: str, schema: "pa.Schema"):
+    if file_format == "parquet":
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_stream(sink, schema)
+
+
+def _write(writer, rows: Sequence[tuple], schema: "pa.Schema") -> None:
+    writer.write_batch(rows_to_batch(rows, schema))
+
+
+async def iter_columnar(
+    rows: AsyncIterator[tuple],
+    file_format: str,
+    columns: Sequence[str] = INTERNSHIP_COLUMNS,
+    batch_size: int = 10000
+) -> AsyncIterator[bytes]:
+    """
+    Кодирует поток строк в Parquet или Arrow IPC (stream) пачками по batch_size строк.
+    Каждая пачка становится row group Parquet или record batch Arrow и сразу отдаётся.
+    Кодирование выполняется в потоке, чтобы не блокировать event loop.
+
+    Аргументы:
+        rows (AsyncIterator[tuple]): Строки выборки.
+        file_format (str): 'parquet' или 'arrow'.
+        columns (Sequence[str]): Колонки строк.
+        batch_size (int): Строк в одной пачке.
+    """
+    schema = internship_schema(columns)
+    sink = _ChunkSink()
+    writer = _open_writer(sink, file_format, schema)
+
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await asyncio.to_thread(_write, writer, batch, schema)
+            batch = []
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+    if batch:
+        await asyncio.to_thread(_write, writer, batch, schema)
+    await asyncio.to_thread(writer.close)
+    yield sink.drain()
+
+
+def write_columnar_file(
+    rows: Iterable[tuple],
+    path: str,
+    file_format: str,
+    columns: Sequence[str] = INTERNSHIP_COLUMNS
+) -> None:
+    """Записывает строки выборки в файл Parquet или Arrow IPC"""
+    schema = internship_schema(columns)
+    with open(path, "wb") as f:
+        writer = _open_writer(f, file_format, schema)
+        rows = list(rows)
+        if rows:
+            _write(writer, rows, schema)
+        writer.close()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from environs import Env
 
@@ -10,6 +10,16 @@ class Database:
     user: str        # Имя пользователя БД
     password: str    # Пароль от БД
     db_name: str     # Название БД
+    keyword_search: str = "like"  # Режим поиска по ключевым словам: like, fulltext или index
+    pool_minsize: int = 1         # Минимум соединений в общем пуле
+    pool_maxsize: int = 10        # Максимум соединений в общем пуле
+    pool_recycle: int = 3600      # Через сколько секунд соединение пересоздаётся
+    replica_hosts: list[str] = field(default_factory=list)  # Реплики для чтения (host или host:port)
+    read_pin_seconds: float = 0.0  # Сколько секунд после сбора вакансий читать из основной БД
+    query_cache: str = "memory"   # Кэш результатов запросов: memory, redis или off
+    query_cache_ttl: float = 60.0  # Время жизни записи кэша (сек)
+    query_cache_size: int = 1024  # Максимум записей кэша в памяти процесса
+    query_cache_url: str = ""     # Адрес Redis для query_cache=redis
 
 
 # Конфиг для настройки Telegram-бота
@@ -38,6 +48,16 @@ def load_config(path: str | None = None) -> Config:
             host=env("DB_HOST"),                 # Хост БД
             user=env("DB_USER"),                 #
             password=env("DB_PASSWORD"),         # Пароль от БД
-            db_name=env("DB_NAME")               # Название БД
+            db_name=env("DB_NAME"),              # Название БД
+            keyword_search=env("DB_KEYWORD_SEARCH", "like"),  # Режим поиска по ключевым словам
+            pool_minsize=env.int("DB_POOL_MINSIZE", 1),       # Размер пула соединений
+            pool_maxsize=env.int("DB_POOL_MAXSIZE", 10),
+            pool_recycle=env.int("DB_POOL_RECYCLE", 3600),
+            replica_hosts=env.list("DB_REPLICA_HOSTS", []),   # Реплики для чтения
+            read_pin_seconds=env.float("DB_READ_PIN_SECONDS", 0.0),
+            query_cache=env("QUERY_CACHE", "memory"),         # Кэш результатов запросов
+            query_cache_ttl=env.float("QUERY_CACHE_TTL", 60.0),
+            query_cache_size=env.int("QUERY_CACHE_SIZE", 1024),
+            query_cache_url=env("QUERY_CACHE_URL", "")
         )
     )
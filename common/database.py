@@ -1,7 +1,15 @@
 import aiomysql
 import asyncio
+import hashlib
+import re
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional
 from common.config import load_config, Config
 from common.logger import get_logger
+from common.query_cache import create_query_cache
 
 
 # Определяем конфиг
@@ -9,9 +17,205 @@ config: Config = load_config()
 
 logger = get_logger(__name__)
 
+# Колонки строк, которые возвращают select_internship_data*
+INTERNSHIP_COLUMNS = (
+    'id', 'title', 'profession', 'company_name', 'salary_from',
+    'salary_to', 'source_name', 'link',
+    'description', 'created_at', 'employment_types'
+)
+
+# Поля internships, которые заполняются при вставке
+INTERNSHIP_INSERT_FIELDS = (
+    'title', 'profession', 'company_name', 'salary_from', 'salary_to',
+    'source_name', 'link', 'description', 'external_id', 'external_updated_at',
+    'source_key', 'employment_mask', 'employment_names'
+)
+
+# Поля, которые обновляются при повторной загрузке той же вакансии
+INTERNSHIP_UPSERT_FIELDS = (
+    'title', 'profession', 'company_name', 'salary_from', 'salary_to',
+    'link', 'description', 'external_id', 'external_updated_at',
+    'employment_mask', 'employment_names'
+)
+
+# Источник данных запросов чтения стажировок: типы занятости денормализованы
+# в internships (employment_mask, employment_names), JOIN и GROUP BY не нужны
+INTERNSHIP_FROM = """
+    FROM internships i
+"""
+
+# Выражение SELECT для каждой колонки INTERNSHIP_COLUMNS
+INTERNSHIP_COLUMN_SQL = {
+    'id': 'i.id',
+    'title': 'i.title',
+    'profession': 'i.profession',
+    'company_name': 'i.company_name',
+    'salary_from': 'i.salary_from',
+    'salary_to': 'i.salary_to',
+    'source_name': 'i.source_name',
+    'link': 'i.link',
+    'description': 'i.description',
+    'created_at': 'i.created_at',
+    'employment_types': 'i.employment_names AS employment_types',
+}
+
+# Часть SELECT, соответствующая INTERNSHIP_COLUMNS
+INTERNSHIP_SELECT = ", ".join(INTERNSHIP_COLUMN_SQL[column] for column in INTERNSHIP_COLUMNS)
+
+# Максимальное значение LIMIT в MySQL - выборка без ограничения, но с OFFSET
+MYSQL_NO_LIMIT = 18446744073709551615
+
+# Типы занятости с id до EMPLOYMENT_MASK_BITS хранятся битами в employment_mask (бит id - 1)
+EMPLOYMENT_MASK_BITS = 64
+
+# Увеличение версии данных (dataset_meta): от неё зависят ETag ответов и ключи query_cache
+DATASET_VERSION_BUMP = """
+    INSERT INTO dataset_meta (id, version) VALUES (1, 1)
+    ON DUPLICATE KEY UPDATE version = version + 1
+"""
+
+
+def canonical_filters(filters: dict) -> str:
+    """Каноничное строковое представление фильтров (порядок ключей и значений не важен)"""
+    normalized = []
+    for key in sorted(filters):
+        value = filters[key]
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(v).strip().lower() for v in value)
+        elif isinstance(value, str):
+            value = value.strip().lower()
+        normalized.append((key, value))
+    return repr(normalized)
+
+
+def normalize_columns(columns: Optional[Iterable[str]]) -> tuple[str, ...]:
+    """
+    Проверяет запрошенные колонки и упорядочивает их как в INTERNSHIP_COLUMNS.
+    id добавляется всегда - по нему работают сортировка и курсор after_id.
+
+    Аргументы:
+        columns: (Optional[Iterable[str]]): Названия колонок (None - все колонки).
+
+    Возвращает:
+        tuple[str, ...]: Колонки строк выборки.
+
+    Исключение:
+        ValueError: Если указана неизвестная колонка.
+    """
+    if not columns:
+        return INTERNSHIP_COLUMNS
+
+    requested = {column.strip() for column in columns if column.strip()}
+    unknown = requested - set(INTERNSHIP_COLUMNS)
+    if unknown:
+        raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+
+    requested.add('id')
+    return tuple(column for column in INTERNSHIP_COLUMNS if column in requested)
+
+
+def project_rows(rows: Iterable[tuple], columns: tuple[str, ...]) -> list[tuple]:
+    """Оставляет в полных строках (INTERNSHIP_COLUMNS) только указанные колонки"""
+    if columns == INTERNSHIP_COLUMNS:
+        return list(rows)
+    indexes = [INTERNSHIP_COLUMNS.index(column) for column in columns]
+    return [tuple(row[idx] for idx in indexes) for row in rows]
+
+
+def employment_bit(employment_id: int) -> int:
+    """Бит типа занятости в employment_mask (0, если id не помещается в маску)"""
+    if 0 < employment_id <= EMPLOYMENT_MASK_BITS:
+        return 1 << (employment_id - 1)
+    return 0
+
+
+def make_source_key(source_name: str, external_id: Optional[str], link: str) -> bytes:
+    """
+    Ключ уникальности вакансии: SHA-256 от источника и ID вакансии на нём
+    (или ссылки, если ID неизвестен).
+    """
+    identity = external_id if external_id else link
+    return hashlib.sha256(f"{source_name}|{identity}".encode("utf-8")).digest()
+
+
+class EmploymentTypesCache:
+    """
+    Общий для процесса справочник типов занятости (название <-> id).
+    Загружается один раз, дополняется при вставке и перечитывается по TTL.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Аргументы:
+            ttl (float): Через сколько секунд справочник перечитывается из БД.
+        """
+        self.ttl = ttl
+        self._ids: dict[str, int] = {}      # casefold-название -> id
+        self._names: dict[int, str] = {}    # id -> название
+        self._loaded_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return bool(self._loaded_at) and time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_loaded(self, connection_pool: aiomysql.Pool) -> None:
+        """Загружает справочник, если он ещё не загружен или устарел"""
+        if self.is_fresh():
+            return
+        async with self._lock:
+            if self.is_fresh():
+                return
+            async with connection_pool.acquire() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT id, name FROM employment_types")
+                    rows = await cursor.fetchall()
+            self._ids.clear()
+            self._names.clear()
+            self.add_many({name: employment_id for employment_id, name in rows})
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    def add_many(self, ids: dict[str, int]) -> None:
+        """Добавляет известные пары название -> id"""
+        for name, employment_id in ids.items():
+            self._ids[name.casefold()] = employment_id
+            self._names[employment_id] = name
+
+    def get_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name.casefold())
+
+    def get_name(self, employment_id: int) -> Optional[str]:
+        """Название типа в том виде, в каком оно хранится в БД"""
+        return self._names.get(employment_id)
+
+    def names(self) -> list[str]:
+        return sorted(self._names.values())
+
+    def match_ids(self, patterns: list[str]) -> list[int]:
+        """id типов, в названии которых встречается любая из подстрок (как LIKE '%...%')"""
+        patterns = [p.strip().casefold() for p in patterns if p.strip()]
+        return sorted(
+            employment_id for employment_id, name in self._names.items()
+            if any(p in name.casefold() for p in patterns)
+        )
+
+
+# Справочник типов занятости, общий для всех таблиц процесса
+employment_types_cache = EmploymentTypesCache()
+
 
 class ConnectTable:
-    def __init__(self, host: str, user: str, password: str, db_name: str):
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        db_name: str,
+        connection_pool: Optional[aiomysql.Pool] = None,
+        database_pool: Optional["DatabasePool"] = None
+    ):
         """
         Инициализирует класс ConnectTable и устанавливает параметры подключения к базе данных.
 
@@ -20,31 +224,220 @@ class ConnectTable:
             user (str): Имя пользователя для подключения.
             password (str): Пароль для подключения.
             db_name (str): Имя базы данных.
+            connection_pool (Optional[aiomysql.Pool]): Общий пул соединений (см. DatabasePool).
+                Если не передан, connect() создаёт собственный пул таблицы.
+            database_pool (Optional[DatabasePool]): Менеджер пулов, выбирающий реплику для чтения.
         """
         self.host = host
         self.user = user
         self.password = password
         self.db_name = db_name
+        self.connection_pool = connection_pool
+        self.database_pool = database_pool
+        self._owns_pool = False
+
+    @property
+    def read_pool(self) -> aiomysql.Pool:
+        """Пул для читающих запросов (реплика или основная БД)"""
+        if self.database_pool is not None:
+            return self.database_pool.read_pool()
+        return self.connection_pool
+
+    async def fetch_read(self, query: str, params=None, fetchone: bool = False):
+        """
+        Выполняет читающий запрос через read_pool. Если реплика недоступна,
+        она исключается из чтения, а запрос повторяется на основной БД.
+
+        Аргументы:
+            query (str): SQL-запрос.
+            params: Параметры запроса.
+            fetchone (bool): Вернуть одну строку вместо всех.
+        """
+        pool = self.read_pool
+        try:
+            return await self._fetch(pool, query, params, fetchone)
+        except aiomysql.OperationalError as e:
+            if pool is self.connection_pool:
+                raise
+            self.database_pool.mark_unhealthy(pool, e)
+            return await self._fetch(self.connection_pool, query, params, fetchone)
+
+    async def fetch_read_versioned(
+        self,
+        query: str,
+        params=None,
+        fetchone: bool = False,
+        min_version: int = 0
+    ) -> tuple[int, object]:
+        """
+        Как fetch_read, но читает версию данных (dataset_meta) и результат запроса из одного
+        снимка БД. Если реплика отстаёт от min_version, запрос выполняется на основной БД:
+        иначе старые строки попали бы в кэш и ответ под ключом и ETag новой версии.
+
+        Аргументы:
+            query (str): SQL-запрос.
+            params: Параметры запроса.
+            fetchone (bool): Вернуть одну строку вместо всех.
+            min_version (int): Версия данных, не старее которой должен быть результат.
+
+        Возвращает:
+            tuple[int, object]: Версия данных снимка и результат запроса.
+        """
+        pool = self.read_pool
+        if pool is not self.connection_pool:
+            try:
+                version, result = await self._fetch_snapshot(pool, query, params, fetchone)
+                if version >= min_version:
+                    return version, result
+                logger.info(f"Реплика отстаёт (версия {version} < {min_version}), чтение с основной БД")
+            except aiomysql.OperationalError as e:
+                self.database_pool.mark_unhealthy(pool, e)
+        return await self._fetch_snapshot(self.connection_pool, query, params, fetchone)
+
+    @asynccontextmanager
+    async def stream_read(
+        self,
+        query: str,
+        params=None,
+        min_version: Optional[int] = None
+    ) -> AsyncIterator[aiomysql.SSCursor]:
+        """
+        Выполняет читающий запрос серверным курсором (SSCursor) через read_pool.
+        Как и в fetch_read, недоступная реплика исключается из чтения, а запрос
+        повторяется на основной БД - до того, как прочитана первая строка.
+
+        Аргументы:
+            query (str): SQL-запрос.
+            params: Параметры запроса.
+            min_version (Optional[int]): Если указана, реплика, отстающая от этой версии
+                данных (dataset_meta), не используется (см. fetch_read_versioned).
+
+        Возвращает:
+            AsyncIterator[aiomysql.SSCursor]: Курсор с выполненным запросом.
+        """
+        pool = self.read_pool
+        async with AsyncExitStack() as stack:
+            cursor = None
+            try:
+                cursor = await self._open_stream(
+                    stack, pool, query, params,
+                    min_version if pool is not self.connection_pool else None
+                )
+            except aiomysql.OperationalError as e:
+                if pool is self.connection_pool:
+                    raise
+                self.database_pool.mark_unhealthy(pool, e)
+            if cursor is None:
+                # Реплика недоступна или отстаёт: возвращаем её соединение и читаем с основной БД
+                await stack.aclose()
+                cursor = await self._open_stream(stack, self.connection_pool, query, params)
+            yield cursor
+
+    async def _open_stream(
+        self,
+        stack: AsyncExitStack,
+        pool: aiomysql.Pool,
+        query: str,
+        params,
+        min_version: Optional[int] = None
+    ) -> Optional[aiomysql.SSCursor]:
+        """Курсор с выполненным запросом; None, если версия данных в пуле старше min_version"""
+        connection = await stack.enter_async_context(pool.acquire())
+        if min_version is not None:
+            # Снимок закрывается после курсора (колбэки стека выполняются в обратном порядке)
+            stack.push_async_callback(self._end_snapshot, connection)
+            if await self._begin_snapshot(connection) < min_version:
+                return None
+        cursor = await stack.enter_async_context(connection.cursor(aiomysql.SSCursor))
+        await cursor.execute(query, params)
+        return cursor
+
+    async def _fetch_snapshot(self, pool: aiomysql.Pool, query: str, params, fetchone: bool) -> tuple[int, object]:
+        async with pool.acquire() as connection:
+            version = await self._begin_snapshot(connection)
+            try:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    result = await (cursor.fetchone() if fetchone else cursor.fetchall())
+            finally:
+                await self._end_snapshot(connection)
+        return version, result
+
+    @staticmethod
+    async def _begin_snapshot(connection: aiomysql.Connection) -> int:
+        """Открывает читающую транзакцию со снимком и возвращает версию данных в нём"""
+        async with connection.cursor() as cursor:
+            await cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT, READ ONLY")
+            await cursor.execute("SELECT version FROM dataset_meta WHERE id = 1")
+            row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    async def _end_snapshot(connection: aiomysql.Connection) -> None:
+        try:
+            await connection.rollback()
+        except aiomysql.Error as e:
+            # Соединение уже разорвано - пул его закроет
+            logger.debug(f"Не удалось завершить снимок чтения: {e}")
+
+    @asynccontextmanager
+    async def named_lock(self, name: str, timeout: int = 0) -> AsyncIterator[bool]:
+        """
+        Именованная блокировка MySQL (GET_LOCK), общая для всех процессов,
+        работающих с этой БД. Соединение удерживается, пока блокировка захвачена.
+
+        Аргументы:
+            name (str): Имя блокировки (дополняется именем БД).
+            timeout (int): Сколько секунд ждать освобождения (0 - не ждать).
+
+        Возвращает:
+            AsyncIterator[bool]: True, если блокировка захвачена.
+        """
+        lock_name = f"{self.db_name}:{name}"[:64]
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, timeout))
+                (acquired,) = await cursor.fetchone()
+            try:
+                yield acquired == 1
+            finally:
+                if acquired == 1:
+                    async with connection.cursor() as cursor:
+                        await cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+
+    @staticmethod
+    async def _fetch(pool: aiomysql.Pool, query: str, params, fetchone: bool):
+        async with pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                return await (cursor.fetchone() if fetchone else cursor.fetchall())
 
     async def connect(self) -> None:
         """
-        Создает пул соединений с базой данных.
+        Создает пул соединений с базой данных, если общий пул не передан.
         """
+        if self.connection_pool is not None:
+            return
         self.connection_pool = await aiomysql.create_pool(
             host=self.host,
             user=self.user,
             password=self.password,
             db=self.db_name,
             autocommit=True,
+            minsize=config.database.pool_minsize,
+            maxsize=config.database.pool_maxsize,
+            pool_recycle=config.database.pool_recycle,
         )
+        self._owns_pool = True
 
     async def close(self) -> None:
         """
-        Закрывает пул соединений с базой данных.
+        Закрывает собственный пул соединений таблицы (общий пул закрывает DatabasePool).
         """
-        if self.connection_pool:
+        if self.connection_pool and self._owns_pool:
             self.connection_pool.close()
             await self.connection_pool.wait_closed()
+            self.connection_pool = None
 
 
 class Sources(ConnectTable):
@@ -113,6 +506,22 @@ class Sources(ConnectTable):
 
 
 class Internships(ConnectTable):
+    # Внешний поисковый бэкенд для режима DB_KEYWORD_SEARCH=index (см. common.search_index)
+    search_backend = None
+
+    # Кэш результатов запросов чтения (common.query_cache); ключи включают версию данных,
+    # поэтому после сбора вакансий или очистки старые записи больше не используются
+    query_cache = create_query_cache(
+        config.database.query_cache,
+        ttl=config.database.query_cache_ttl,
+        max_entries=config.database.query_cache_size,
+        url=config.database.query_cache_url
+    )
+
+    # Версия данных (dataset_meta) кэшируется в процессе на version_ttl секунд
+    version_ttl: float = 5.0
+    _version: tuple[float, int, float] = (0.0, 0, 0.0)
+
     async def insert_internship(
         self,
         title: str,
@@ -123,7 +532,9 @@ class Internships(ConnectTable):
         employment: str,
         source_name: str,
         link: str,
-        description: str
+        description: str,
+        external_id: Optional[str] = None,
+        external_updated_at: Optional[datetime] = None
     ) -> None:
         """
         Добавляет новую запись о стажировке в таблицу internships и связывает её с типами занятости.
@@ -138,41 +549,172 @@ class Internships(ConnectTable):
             source_name: (str): Название источника.
             link: (str): Ссылка на объявление.
             description: (str): Описание стажировки (Что не попало под шаблон).
+            external_id: (Optional[str]): ID вакансии на источнике.
+            external_updated_at: (Optional[datetime]): Время обновления вакансии на источнике.
         """
-        async with self.connection_pool.acquire() as connection:
-            async with connection.cursor() as cursor:
-                insert_internship = f"""
-                    INSERT INTO internships (title, profession, company_name, salary_from, salary_to, source_name, link, description)
-                    VALUES ('{title}', '{profession}', '{company_name}', '{salary_from}', '{salary_to}', '{source_name}', '{link}', '{description}');
-                """
-                await cursor.execute(insert_internship)
-
-                # Получаем ID стажировки
-                internship_id = cursor.lastrowid
-
-                # Цикл для добавления типов занятости, которых нет в таблице
-                while True:
-                    try:
-                        # Получаем ID типа занятости
-                        await cursor.execute(f"SELECT id FROM employment_types WHERE name = '{employment}'")
-                        row = await cursor.fetchone()
-                        employment_id = row[0]
-                        break
-                    except TypeError:
-                        await cursor.execute(f"INSERT IGNORE INTO employment_types (name) VALUES ('{employment}');")
-
-                # Связываем их
-                add_relation = f"""
-                INSERT INTO internship_employment (internship_id, employment_id)
-                VALUES ('{internship_id}', '{employment_id}')
-                """
-                await cursor.execute(add_relation)
+        await self.insert_internships_bulk([{
+            "title": title,
+            "profession": profession,
+            "company_name": company_name,
+            "salary_from": salary_from,
+            "salary_to": salary_to,
+            "employment": employment,
+            "source_name": source_name,
+            "link": link,
+            "description": description,
+            "external_id": external_id,
+            "external_updated_at": external_updated_at,
+        }])
+
+    async def insert_internships_bulk(self, records: list[dict], batch_size: int = 500) -> int:
+        """
+        Добавляет или обновляет пачку стажировок: по одному многострочному
+        INSERT ... ON DUPLICATE KEY UPDATE на пачку (ключ - source_key),
+        типы занятости и связи с ними пишутся set-based запросами в той же транзакции.
+        Вместе со строкой обновляются денормализованные employment_mask и employment_names,
+        а каждая пачка в своей транзакции увеличивает версию данных.
+
+        Аргументы:
+            records: (list[dict]): Записи с ключами аргументов insert_internship.
+            batch_size: (int): Сколько записей пишется одной транзакцией.
 
-    async def select_internship_data(self, **kwargs) -> tuple:
+        Возвращает:
+            int: Количество записанных записей.
+        """
+        await employment_types_cache.ensure_loaded(self.connection_pool)
+
+        inserted = 0
+        for start in range(0, len(records), batch_size):
+            batch = [
+                {
+                    **record,
+                    "source_key": record.get("source_key") or make_source_key(
+                        record["source_name"], record.get("external_id"), record["link"]
+                    ),
+                }
+                for record in records[start:start + batch_size]
+            ]
+
+            async with self.connection_pool.acquire() as connection:
+                await connection.begin()
+                try:
+                    async with connection.cursor() as cursor:
+                        employment_types = await self._resolve_employment_ids(
+                            cursor, {r["employment"] for r in batch if r.get("employment")}
+                        )
+                        for record in batch:
+                            employment_id, employment_name = employment_types.get(
+                                record.get("employment"), (None, None)
+                            )
+                            record["employment_mask"] = employment_bit(employment_id) if employment_id else 0
+                            record["employment_names"] = employment_name
+
+                        row_placeholder = "(" + ", ".join(["%s"] * len(INTERNSHIP_INSERT_FIELDS)) + ")"
+                        updates = ", ".join(
+                            f"{field} = incoming.{field}" for field in INTERNSHIP_UPSERT_FIELDS
+                        )
+                        upsert_internships = f"""
+                            INSERT INTO internships ({", ".join(INTERNSHIP_INSERT_FIELDS)})
+                            VALUES {", ".join([row_placeholder] * len(batch))} AS incoming
+                            ON DUPLICATE KEY UPDATE {updates}, last_seen_at = CURRENT_TIMESTAMP
+                        """
+                        await cursor.execute(upsert_internships, [
+                            record.get(field) for record in batch for field in INTERNSHIP_INSERT_FIELDS
+                        ])
+
+                        # id строк (новых и обновлённых) берутся по ключу уникальности
+                        keys = list({record["source_key"] for record in batch})
+                        placeholders = ", ".join(["%s"] * len(keys))
+                        await cursor.execute(
+                            f"SELECT source_key, id FROM internships WHERE source_key IN ({placeholders})",
+                            keys
+                        )
+                        ids = dict(await cursor.fetchall())
+
+                        # Связи с типами занятости пересобираются для всей пачки
+                        internship_ids = list(ids.values())
+                        id_placeholders = ", ".join(["%s"] * len(internship_ids))
+                        await cursor.execute(
+                            f"DELETE FROM internship_employment WHERE internship_id IN ({id_placeholders})",
+                            internship_ids
+                        )
+                        relations = list({
+                            (ids[record["source_key"]], employment_types[record["employment"]][0])
+                            for record in batch
+                            if record.get("employment") in employment_types
+                        })
+                        if relations:
+                            await cursor.executemany(
+                                "INSERT INTO internship_employment (internship_id, employment_id) VALUES (%s, %s)",
+                                relations
+                            )
+
+                        # Пачка меняет ответы API - версия данных (ETag, ключи кэша) меняется вместе с ней
+                        await cursor.execute(DATASET_VERSION_BUMP)
+                    await connection.commit()
+                except Exception:
+                    await connection.rollback()
+                    raise
+
+            Internships._version = (0.0, 0, 0.0)
+            # Новые типы попадают в справочник только после фиксации транзакции
+            employment_types_cache.add_many(
+                {name: employment_id for employment_id, name in employment_types.values()}
+            )
+            inserted += len(batch)
+
+        return inserted
+
+    async def _resolve_employment_ids(
+        self,
+        cursor: aiomysql.Cursor,
+        names: set[str]
+    ) -> dict[str, tuple[int, str]]:
+        """
+        Возвращает id и название типов занятости в том написании, в каком они хранятся в БД
+        (ключ - название из записи). В БД обращается только за типами, которых нет в справочнике.
+        Такие типы сопоставляются по строке, которую вернула БД для каждого названия: сравнение
+        идёт по коллации столбца (регистр, ё/е и диакритика не различаются), а не по casefold.
+        """
+        types = {}
+        missing = []
+        for name in names:
+            employment_id = employment_types_cache.get_id(name)
+            if employment_id is None:
+                missing.append(name)
+            else:
+                types[name] = (employment_id, employment_types_cache.get_name(employment_id))
+
+        if missing:
+            await cursor.execute(
+                f"INSERT IGNORE INTO employment_types (name) VALUES {', '.join(['(%s)'] * len(missing))}",
+                missing
+            )
+            lookup = " UNION ALL ".join(
+                ["SELECT %s, id, name FROM employment_types WHERE name = %s"] * len(missing)
+            )
+            await cursor.execute(lookup, [value for name in missing for value in (name, name)])
+            for name, employment_id, stored_name in await cursor.fetchall():
+                types[name] = (employment_id, stored_name)
+
+        return types
+
+    async def select_internship_data(
+        self,
+        limit: int = 10000,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> tuple:
         """
         Получает данные о стажировке с типами занятости по фильтрам.
 
         Аргументы:
+            limit: (int): Максимум записей.
+            offset: (int): Смещение (пропуск записей).
+            after_id: (Optional[int]): Курсор - вернуть записи с id больше указанного.
+            columns: (Optional[Iterable[str]]): Колонки выборки (см. normalize_columns), None - все.
             kwargs: Возможные фильтры:
                 profession: (str): Название профессии.
                 company_name: (str): Название компании.
@@ -183,64 +725,135 @@ class Internships(ConnectTable):
                 description: (str): Описание стажировки (что не попало под шаблон)
 
         Возвращает:
-            tuple: Кортеж с данными стажировок и их типами занятости
+            tuple: Кортеж с данными стажировок и их типами занятости (по возрастанию id)
         """
+        columns = normalize_columns(columns)
 
-        base_query = """
-            SELECT
-                i.*,
-                GROUP_CONCAT(DISTINCT et.name ORDER BY et.name SEPARATOR ', ') AS employment_types
-            FROM internships i
-            LEFT JOIN internship_employment ie ON i.id = ie.internship_id
-            LEFT JOIN employment_types et ON ie.employment_id = et.id
-            WHERE 1=1
-        """
-        params = {}
-        conditions = []
+        async def load(version: int):
+            params, conditions = await self._build_filter_conditions(kwargs)
+            return await self._execute_query(params, conditions, limit, offset, after_id, columns, version)
 
-        employment_cond = self._build_employment_condition(
-            kwargs.pop('employment_type', []),
-            params
-        )
-        if employment_cond:
-            conditions.append(employment_cond)
-
-        conditions += self._build_salary_conditions(kwargs, params)
+        key = f"filters:{canonical_filters(kwargs)}:{limit}:{offset}:{after_id}:{','.join(columns)}"
+        return await self._cached_query(key, load)
 
-        conditions += self._build_text_conditions(params, kwargs)
-
-        return await self._execute_query(
-            base_query, params, conditions, limit=10000
-        )
+    async def count_internship_data(self, **kwargs) -> int:
+        """
+        Считает стажировки, подходящие под фильтры select_internship_data.
+        Результат кэшируется в query_cache до смены версии данных.
+        """
+        return await self._cached_count("filters", kwargs, self._build_filter_conditions)
 
-    async def select_internship_data_by_keywords(self, **kwargs) -> tuple:
+    async def select_internship_data_by_keywords(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None,
+        **kwargs
+    ) -> tuple:
         """
         Получает данные о стажировке с типами занятости по ключевым словам c поддержкой исключений.
 
         Аргументы:
+            limit: (int): Максимум записей.
+            offset: (int): Смещение (пропуск записей).
+            after_id: (Optional[int]): Курсор - вернуть записи с id больше указанного.
+            columns: (Optional[Iterable[str]]): Колонки выборки (см. normalize_columns), None - все.
             kwargs: Возможные фильтры:
                 keywords: (list): Ключевые слова для поиска. Слова, начинающиеся с '-', исключают записи.
                 salary_from: (int): Минимальная зарплата.
                 salary_to: (int): Максимальная зарплата.
                 employment_type: (str): Тип занятости
+                search_mode: (str): 'like', 'fulltext' или 'index' (по умолчанию из конфига DB_KEYWORD_SEARCH)
 
         Возвращает:
-            tuple: Кортеж с данными стажировок и их типами занятости.
+            tuple: Кортеж с данными стажировок и их типами занятости (по возрастанию id).
         """
+        columns = normalize_columns(columns)
+
+        backend = await self._keyword_backend(kwargs)
+        if backend is not None:
+            include, exclude = self._parse_keywords(kwargs.get('keywords', ''))
+            rows = backend.search(
+                include,
+                exclude,
+                salary_from=kwargs.get('salary_from'),
+                salary_to=kwargs.get('salary_to'),
+                employment_type=kwargs.get('employment_type'),
+                limit=limit,
+                offset=offset,
+                after_id=after_id
+            )
+            return project_rows(rows, columns)
+
+        async def load(version: int):
+            params, conditions = await self._build_keyword_conditions(kwargs)
+            return await self._execute_query(params, conditions, limit, offset, after_id, columns, version)
+
+        key = f"keywords:{canonical_filters(kwargs)}:{limit}:{offset}:{after_id}:{','.join(columns)}"
+        return await self._cached_query(key, load)
 
-        base_query = """
-            SELECT
-                i.*,
-                GROUP_CONCAT(DISTINCT et.name ORDER BY et.name SEPARATOR ', ') AS employment_types
-            FROM internships i
-            LEFT JOIN internship_employment ie ON i.id = ie.internship_id
-            LEFT JOIN employment_types et ON ie.employment_id = et.id
-            WHERE 1=1
+    async def count_internship_data_by_keywords(self, **kwargs) -> int:
+        """
+        Считает стажировки, подходящие под запрос select_internship_data_by_keywords.
+        Результат кэшируется в query_cache до смены версии данных.
+        """
+        backend = await self._keyword_backend(kwargs)
+        if backend is not None:
+            include, exclude = self._parse_keywords(kwargs.get('keywords', ''))
+            return backend.count(
+                include,
+                exclude,
+                salary_from=kwargs.get('salary_from'),
+                salary_to=kwargs.get('salary_to'),
+                employment_type=kwargs.get('employment_type')
+            )
+
+        return await self._cached_count("keywords", kwargs, self._build_keyword_conditions)
+
+    async def _keyword_backend(self, filters: dict):
+        """
+        Возвращает поисковый бэкенд, если выбран режим index и индекс построен
+        на текущей версии данных. Если данные изменились (сбор или очистка в другом
+        процессе), индекс обновляется в фоне, а до конца обновления поиск идёт в SQL.
         """
+        search_mode = filters.get('search_mode') or config.database.keyword_search
+        backend = self.search_backend
+        if search_mode != 'index' or backend is None or not backend.ready:
+            return None
+        if backend.version != await self.dataset_version():
+            backend.refresh_in_background(self)
+            return None
+        return backend
+
+    async def _build_filter_conditions(self, filters: dict) -> tuple[dict, list]:
+        """Строит параметры и условия WHERE для select_internship_data."""
+        kwargs = dict(filters)
+        params = {}
+        conditions = []
+
+        await employment_types_cache.ensure_loaded(self.connection_pool)
+        employment_cond = self._build_employment_condition(
+            kwargs.pop('employment_type', []),
+            params
+        )
+        if employment_cond:
+            conditions.append(employment_cond)
+
+        conditions += self._build_salary_conditions(kwargs, params)
+
+        conditions += self._build_text_conditions(params, kwargs)
+
+        return params, conditions
+
+    async def _build_keyword_conditions(self, filters: dict) -> tuple[dict, list]:
+        """Строит параметры и условия WHERE для select_internship_data_by_keywords."""
+        kwargs = dict(filters)
         params = {}
         conditions = []
 
         include, exclude = self._parse_keywords(kwargs.pop('keywords', ''))
+        search_mode = kwargs.pop('search_mode', None) or config.database.keyword_search
         text_columns = [
             'i.profession', 'i.title', 'i.company_name',
             'i.source_name', 'i.description'
@@ -249,14 +862,18 @@ class Internships(ConnectTable):
         logger.debug("Include conditions: %s", include)
         logger.debug("Exclude conditions: %s", exclude)
 
-        include_conds = self._build_include_conditions(include, text_columns, params)
-        if include_conds:
-            conditions.append(include_conds)
+        if search_mode == 'fulltext':
+            conditions += self._build_fulltext_conditions(include, exclude, params)
+        else:
+            include_conds = self._build_include_conditions(include, text_columns, params)
+            if include_conds:
+                conditions.append(include_conds)
 
-        exclude_conds = self._build_exclude_conditions(exclude, text_columns, params)
-        if exclude_conds:
-            conditions.append(exclude_conds)
+            exclude_conds = self._build_exclude_conditions(exclude, text_columns, params)
+            if exclude_conds:
+                conditions.append(exclude_conds)
 
+        await employment_types_cache.ensure_loaded(self.connection_pool)
         employment_cond = self._build_employment_condition(
             kwargs.pop('employment_type', []),
             params
@@ -266,7 +883,7 @@ class Internships(ConnectTable):
 
         conditions += self._build_salary_conditions(kwargs, params)
 
-        return await self._execute_query(base_query, params, conditions)
+        return params, conditions
 
     def _parse_keywords(self, keywords: str) -> tuple:
         """Парсит ключевые слова на включающие и исключающие."""
@@ -286,27 +903,163 @@ class Internships(ConnectTable):
 
     async def _execute_query(
         self,
-        base_query: str,
         params: dict,
         conditions: list,
         limit: int = 100,
-        offset: int = 0
-    ) -> tuple:
-        """Выполняет SQL-запрос с параметрами."""
-        full_query = base_query
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        columns: tuple[str, ...] = INTERNSHIP_COLUMNS,
+        min_version: int = 0
+    ) -> tuple[int, tuple]:
+        """
+        Выполняет SQL-запрос с параметрами (LIMIT/OFFSET или курсор по i.id).
+        Возвращает версию данных, из снимка которой прочитаны строки, и сами строки.
+        """
+        full_query = self._build_query(params, conditions, limit, offset, after_id, columns)
+        return await self.fetch_read_versioned(full_query, params, min_version=min_version)
+
+    def _build_query(
+        self,
+        params: dict,
+        conditions: list,
+        limit: int,
+        offset: int,
+        after_id: Optional[int],
+        columns: tuple[str, ...] = INTERNSHIP_COLUMNS
+    ) -> str:
+        """Собирает SELECT по условиям; дописывает в params курсор и LIMIT/OFFSET."""
+        select = ", ".join(INTERNSHIP_COLUMN_SQL[column] for column in columns)
+        full_query = f"SELECT {select} {INTERNSHIP_FROM} WHERE 1=1"
+        if after_id is not None:
+            conditions = conditions + ["i.id > %(after_id)s"]
+            params['after_id'] = after_id
         if conditions:
             full_query += " AND " + " AND ".join(conditions)
-        full_query += " GROUP BY i.id LIMIT %(limit)s OFFSET %(offset)s"
+        full_query += " ORDER BY i.id LIMIT %(limit)s OFFSET %(offset)s"
 
         params.update({
             'limit': limit,
             'offset': offset
         })
+        return full_query
+
+    async def stream_internship_data(
+        self,
+        limit: Optional[int] = 10000,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+        columns: Optional[Iterable[str]] = None,
+        batch_size: int = 500,
+        min_version: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[tuple]:
+        """
+        Построчно отдаёт результат select_internship_data (или select_internship_data_by_keywords,
+        если в фильтрах есть keywords), читая его серверным курсором: в памяти
+        одновременно не больше batch_size строк, кэш результатов не используется.
+
+        Аргументы:
+            limit: (Optional[int]): Максимум записей (None - без ограничения).
+            offset: (int): Смещение (пропуск записей).
+            after_id: (Optional[int]): Курсор - вернуть записи с id больше указанного.
+            columns: (Optional[Iterable[str]]): Колонки выборки (см. normalize_columns), None - все.
+            batch_size: (int): Сколько строк забирается с сервера за раз.
+            min_version: (Optional[int]): Версия данных, от которой не должна отставать реплика
+                (версия ETag ответа); отстающая реплика заменяется основной БД.
+            kwargs: Фильтры select_internship_data или select_internship_data_by_keywords.
+
+        Возвращает:
+            AsyncIterator[tuple]: Строки с колонками normalize_columns(columns) по возрастанию id.
+        """
+        if limit is None:
+            limit = MYSQL_NO_LIMIT
+        columns = normalize_columns(columns)
+
+        if kwargs.get('keywords'):
+            backend = await self._keyword_backend(kwargs)
+            if backend is not None:
+                for row in await self.select_internship_data_by_keywords(limit, offset, after_id, columns, **kwargs):
+                    yield row
+                return
+            params, conditions = await self._build_keyword_conditions(kwargs)
+        else:
+            params, conditions = await self._build_filter_conditions(kwargs)
+
+        full_query = self._build_query(params, conditions, limit, offset, after_id, columns)
+        async with self.stream_read(full_query, params, min_version) as cursor:
+            while True:
+                rows = await cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+
+    async def _cached_count(self, kind: str, filters: dict, build_conditions) -> int:
+        """COUNT по условиям фильтров через query_cache."""
+        async def load(version: int):
+            params, conditions = await build_conditions(filters)
+            query = f"SELECT COUNT(*) {INTERNSHIP_FROM} WHERE 1=1"
+            if conditions:
+                query += " AND " + " AND ".join(conditions)
+            read_version, (total,) = await self.fetch_read_versioned(
+                query, params, fetchone=True, min_version=version
+            )
+            return read_version, total
+
+        return await self._cached_query(f"count:{kind}:{canonical_filters(filters)}", load)
+
+    async def _cached_query(self, key: str, load):
+        """
+        Возвращает результат из query_cache или выполняет load(version) и кэширует его.
+        load возвращает версию данных, из снимка которой прочитан результат, и сам результат:
+        ключ кэша дополняется именно ею, а не версией, прочитанной отдельно с основной БД.
+        """
+        version = await self.dataset_version()
+        if self.query_cache is not None:
+            result = await self.query_cache.get(f"v{version}:{key}")
+            if result is not None:
+                return result
+
+        read_version, result = await load(version)
+        if read_version > version:
+            # Данные уже новее версии в кэше процесса - перечитываем её при следующем запросе
+            Internships._version = (0.0, 0, 0.0)
+        if self.query_cache is not None:
+            await self.query_cache.set(f"v{read_version}:{key}", result)
+        return result
+
+    async def dataset_version(self) -> int:
+        """Текущая версия данных из dataset_meta (кэшируется на version_ttl секунд)."""
+        version, _ = await self.dataset_state()
+        return version
+
+    async def dataset_state(self) -> tuple[int, float]:
+        """
+        Версия данных и время её изменения из dataset_meta (кэшируется на version_ttl секунд).
+
+        Возвращает:
+            tuple[int, float]: Номер версии и время изменения (unix time).
+        """
+        cached_at, version, updated_at = Internships._version
+        if cached_at and time.monotonic() - cached_at < self.version_ttl:
+            return version, updated_at
 
         async with self.connection_pool.acquire() as connection:
             async with connection.cursor() as cursor:
-                await cursor.execute(full_query, params)
-                return await cursor.fetchall()
+                await cursor.execute(
+                    "SELECT version, UNIX_TIMESTAMP(updated_at) FROM dataset_meta WHERE id = 1"
+                )
+                row = await cursor.fetchone()
+        version, updated_at = (int(row[0]), float(row[1] or 0)) if row else (0, 0.0)
+        Internships._version = (time.monotonic(), version, updated_at)
+        return version, updated_at
+
+    async def bump_dataset_version(self) -> None:
+        """Увеличивает версию данных - закэшированные результаты запросов перестают использоваться."""
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(DATASET_VERSION_BUMP)
+        Internships._version = (0.0, 0, 0.0)
 
     def _build_like_conditions(
         self,
@@ -335,26 +1088,47 @@ class Internships(ConnectTable):
         return " OR ".join(conditions)
 
     def _build_employment_condition(self, employment_types: list, params: dict) -> str:
-        """Условие для занятости с использованием общей функции."""
+        """
+        Условие для занятости: названия сопоставляются с id по справочнику,
+        затем проверяется бит в employment_mask. Типы с id вне маски
+        ищутся по связующей таблице.
+        """
         if not employment_types:
             return ""
 
-        conditions_str = self._build_like_conditions(
-            values=employment_types,
-            columns=["et2.name"],
-            params=params,
-            param_prefix="employment_type"
-        )
+        if isinstance(employment_types, str):
+            employment_types = [employment_types]
 
-        return f"""
-            EXISTS (
-                SELECT 1
-                FROM internship_employment ie2
-                JOIN employment_types et2 ON ie2.employment_id = et2.id
-                WHERE ie2.internship_id = i.id
-                AND ({conditions_str})
-            )
-        """
+        employment_ids = employment_types_cache.match_ids(employment_types)
+        if not employment_ids:
+            return "1=0"
+
+        conditions = []
+        mask = 0
+        for employment_id in employment_ids:
+            mask |= employment_bit(employment_id)
+        if mask:
+            conditions.append("(i.employment_mask & %(employment_mask)s) <> 0")
+            params['employment_mask'] = mask
+
+        placeholders = []
+        for idx, employment_id in enumerate(employment_ids):
+            if employment_bit(employment_id):
+                continue
+            param_name = f"employment_id_{idx}"
+            placeholders.append(f"%({param_name})s")
+            params[param_name] = employment_id
+        if placeholders:
+            conditions.append(f"""
+                EXISTS (
+                    SELECT 1
+                    FROM internship_employment ie2
+                    WHERE ie2.internship_id = i.id
+                    AND ie2.employment_id IN ({', '.join(placeholders)})
+                )
+            """)
+
+        return f"({' OR '.join(conditions)})"
 
     def _build_text_conditions(self, params: dict, filters: dict) -> list:
         """Унифицированная обработка текстовых фильтров."""
@@ -430,74 +1204,407 @@ class Internships(ConnectTable):
         # Объединяем условия через AND
         return f"({' AND '.join(conditions)})" if conditions else ""
 
+    def _build_fulltext_conditions(self, include: list, exclude: list, params: dict) -> list:
+        """
+        Строит условия MATCH ... AGAINST в boolean mode по индексу ft_internships_text.
+        Включающие слова объединяются через ИЛИ, исключающие отбрасывают запись.
+        """
+        match = "MATCH(i.title, i.profession, i.company_name, i.description)"
+        include_terms = [term for term in map(self._fulltext_term, include) if term]
+        exclude_terms = [term for term in map(self._fulltext_term, exclude) if term]
+
+        if include_terms:
+            params['ft_query'] = " ".join(include_terms + [f"-{term}" for term in exclude_terms])
+            return [f"{match} AGAINST (%(ft_query)s IN BOOLEAN MODE)"]
+
+        # Запрос из одних исключений boolean mode не находит - инвертируем совпадение
+        if exclude_terms:
+            params['ft_exclude'] = " ".join(exclude_terms)
+            return [f"NOT {match} AGAINST (%(ft_exclude)s IN BOOLEAN MODE)"]
+
+        return []
+
+    @staticmethod
+    def _fulltext_term(word: str) -> str:
+        """Экранирует слово как фразу boolean mode (операторы внутри слова удаляются)."""
+        cleaned = " ".join(re.sub(r'[+\-<>()~*"@]', ' ', word).split())
+        return f'"{cleaned}"' if cleaned else ""
+
+    async def select_internships_for_index(self, since: Optional[datetime] = None) -> tuple[datetime, tuple]:
+        """
+        Возвращает записи для поискового индекса, изменившиеся или встреченные с момента since.
+
+        Аргументы:
+            since: (Optional[datetime]): Время прошлого обновления индекса (None - все записи).
+
+        Возвращает:
+            tuple[datetime, tuple]: Время БД на момент выборки и строки в формате INTERNSHIP_COLUMNS.
+        """
+        # Читаем из основной БД: на отстающей реплике watermark опережал бы данные
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT NOW()")
+                (watermark,) = await cursor.fetchone()
+
+                select = f"""
+                    SELECT {INTERNSHIP_SELECT}
+                    {INTERNSHIP_FROM}
+                    WHERE %(since)s IS NULL OR i.last_seen_at >= %(since)s
+                """
+                await cursor.execute(select, {'since': since})
+                rows = await cursor.fetchall()
+
+        return watermark, rows
+
+    async def select_internship_ids(self) -> list[int]:
+        """Возвращает id всех стажировок."""
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute("SELECT id FROM internships")
+                rows = await cursor.fetchall()
+
+        return [row[0] for row in rows]
+
+    async def select_external_versions(self, source_name: str) -> dict[str, Optional[datetime]]:
+        """
+        Возвращает сохранённые вакансии источника и время их обновления.
+
+        Аргументы:
+            source_name: (str): Название источника.
+
+        Возвращает:
+            dict[str, Optional[datetime]]: ID вакансии на источнике -> время обновления.
+        """
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                select = """
+                    SELECT external_id, external_updated_at
+                    FROM internships
+                    WHERE source_name = %s AND external_id IS NOT NULL
+                """
+                await cursor.execute(select, (source_name,))
+                rows = await cursor.fetchall()
+
+        return {external_id: updated_at for external_id, updated_at in rows}
+
+    async def touch_internships(self, source_name: str, external_ids: list[str]) -> None:
+        """
+        Отмечает вакансии как встреченные в выдаче, не перезагружая их.
+
+        Аргументы:
+            source_name: (str): Название источника.
+            external_ids: (list[str]): ID вакансий на источнике.
+        """
+        if not external_ids:
+            return
+
+        placeholders = ", ".join(["%s"] * len(external_ids))
+        async with self.connection_pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                update = f"""
+                    UPDATE internships
+                    SET last_seen_at = CURRENT_TIMESTAMP
+                    WHERE source_name = %s AND external_id IN ({placeholders})
+                """
+                await cursor.execute(update, (source_name, *external_ids))
+
     async def update_internships(self, days: int = 7) -> None:
         """
-        Удаляет старые записи стажировок из базы данных.
+        Удаляет записи стажировок, которые давно не встречались в выдаче.
         Аргументы:
             days: (int): Промежуток для определения устаревших записей.
         """
         async with self.connection_pool.acquire() as connection:
             async with connection.cursor() as cursor:
-                # Удаляем записи старше указанного количества дней
+                # Удаляем записи, не встречавшиеся указанное количество дней
                 delete_query = """
                     DELETE FROM internships
-                    WHERE created_at < DATE_SUB(NOW(), INTERVAL %s DAY)
+                    WHERE last_seen_at < DATE_SUB(NOW(), INTERVAL %s DAY)
                 """
                 await cursor.execute(delete_query, (days,))
                 affected_rows = cursor.rowcount
         logger.info(f"Удалено устаревших записей: {affected_rows}")
 
+        if affected_rows:
+            await self.bump_dataset_version()
+
 
 class EmploymentTypes(ConnectTable):
     async def select_employment_types(self) -> tuple[str]:
         """
-        Возвращает все типы занятости.
+        Возвращает все типы занятости из общего справочника процесса.
 
         Возвращает:
             tuple[str]: Кортеж со всеми доступными типами занятости.
         """
-        async with self.connection_pool.acquire() as connection:
-            async with connection.cursor() as cursor:
-                select = """ SELECT name FROM employment_types; """
-                await cursor.execute(select)
-                rows = await cursor.fetchall()
+        try:
+            await employment_types_cache.ensure_loaded(self.read_pool)
+        except aiomysql.OperationalError as e:
+            if self.database_pool is None:
+                raise
+            self.database_pool.mark_unhealthy(self.read_pool, e)
+            await employment_types_cache.ensure_loaded(self.connection_pool)
+        return employment_types_cache.names()
+
+
+@dataclass
+class Replica:
+    """
+    Реплика для чтения.
 
-        return [row[0] for row in rows]
+    Аргументы:
+        host (str): Хост реплики.
+        port (int): Порт реплики.
+        pool (Optional[aiomysql.Pool]): Пул соединений (None, пока не открыт).
+        retry_at (float): Время (monotonic), до которого реплика считается неисправной.
+    """
+    host: str
+    port: int = 3306
+    pool: Optional[aiomysql.Pool] = None
+    retry_at: float = 0.0
 
+    @property
+    def healthy(self) -> bool:
+        return self.pool is not None and time.monotonic() >= self.retry_at
 
-async def initialize_databases() -> tuple:
-    """
-    Инициализирует соединения с базами данных для таблиц.
+    @property
+    def load(self) -> float:
+        """Доля занятых соединений пула"""
+        return (self.pool.size - self.pool.freesize) / self.pool.maxsize
 
-    Создает экземпляры классов, устанавливает
-    соединения с базами данных и возвращает их.
 
-    Возвращает:
-        tuple: Кортеж, содержащий экземпляры классов.
+def split_host(address: str, default_port: int = 3306) -> tuple[str, int]:
+    """Разбирает адрес вида host или host:port"""
+    host, _, port = address.strip().partition(":")
+    return host, int(port) if port else default_port
+
+
+class DatabasePool:
     """
-    sources_table = Sources(
-        config.database.host,
-        config.database.user,
-        config.database.password,
-        config.database.db_name
-    )
+    Общий пул соединений процесса. Открывается при запуске API или бота,
+    закрывается при остановке; все таблицы работают через него.
 
-    internships_table = Internships(
-        config.database.host,
-        config.database.user,
-        config.database.password,
-        config.database.db_name
-    )
+    Запись идёт в основную БД, чтение - в наименее загруженную исправную
+    реплику (если реплики заданы), иначе в основную БД.
+    """
 
-    employment_types_table = EmploymentTypes(
-        config.database.host,
-        config.database.user,
-        config.database.password,
-        config.database.db_name
-    )
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        db_name: str,
+        minsize: int = 1,
+        maxsize: int = 10,
+        pool_recycle: int = 3600,
+        replica_hosts: Optional[list[str]] = None,
+        replica_retry: float = 30.0,
+        read_pin_seconds: float = 0.0
+    ):
+        """
+        Аргументы:
+            host (str): Хост основной базы данных (host или host:port).
+            user (str): Имя пользователя для подключения.
+            password (str): Пароль для подключения.
+            db_name (str): Имя базы данных.
+            minsize (int): Минимум открытых соединений.
+            maxsize (int): Максимум соединений.
+            pool_recycle (int): Через сколько секунд соединение пересоздаётся.
+            replica_hosts (Optional[list[str]]): Адреса реплик для чтения.
+            replica_retry (float): Через сколько секунд снова пробовать неисправную реплику.
+            read_pin_seconds (float): Сколько секунд после pin_reads() читать из основной БД.
+        """
+        self.host, self.port = split_host(host)
+        self.user = user
+        self.password = password
+        self.db_name = db_name
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.pool_recycle = pool_recycle
+        self.replicas = [Replica(*split_host(address)) for address in replica_hosts or [] if address.strip()]
+        self.replica_retry = replica_retry
+        self.read_pin_seconds = read_pin_seconds
+        self.pool: Optional[aiomysql.Pool] = None
+        self._pinned_until = 0.0
+        self._tables: Optional[tuple] = None
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> aiomysql.Pool:
+        """Создаёт пулы при первом обращении и возвращает пул основной БД"""
+        if self.pool is not None:
+            return self.pool
+        async with self._lock:
+            if self.pool is None:
+                self.pool = await self._create_pool(self.host, self.port)
+                logger.info(f"Открыт пул соединений с БД ({self.minsize}-{self.maxsize})")
+                for replica in self.replicas:
+                    await self._open_replica(replica)
+        return self.pool
+
+    async def tables(self) -> tuple:
+        """
+        Возвращает таблицы, работающие через общий пул.
+
+        Возвращает:
+            tuple: Экземпляры Sources, Internships, EmploymentTypes.
+        """
+        pool = await self.open()
+        if self._tables is None:
+            args = (self.host, self.user, self.password, self.db_name)
+            self._tables = (
+                Sources(*args, connection_pool=pool, database_pool=self),
+                Internships(*args, connection_pool=pool, database_pool=self),
+                EmploymentTypes(*args, connection_pool=pool, database_pool=self),
+            )
+        return self._tables
+
+    def read_pool(self) -> aiomysql.Pool:
+        """
+        Пул для чтения: наименее загруженная исправная реплика.
+        Основная БД - если реплик нет, все неисправны или чтение закреплено за ней.
+        """
+        if time.monotonic() < self._pinned_until:
+            return self.pool
+        replicas = [replica for replica in self.replicas if replica.healthy]
+        if not replicas:
+            return self.pool
+        return min(replicas, key=lambda replica: replica.load).pool
+
+    def pin_reads(self, seconds: Optional[float] = None) -> None:
+        """
+        Закрепляет чтение за основной БД (read-your-writes после сбора вакансий),
+        пока реплики догоняют записанное.
+
+        Аргументы:
+            seconds (Optional[float]): Длительность (по умолчанию read_pin_seconds).
+        """
+        seconds = self.read_pin_seconds if seconds is None else seconds
+        if seconds > 0 and self.replicas:
+            self._pinned_until = max(self._pinned_until, time.monotonic() + seconds)
+
+    def mark_unhealthy(self, pool: aiomysql.Pool, error: Exception) -> None:
+        """Исключает реплику из чтения на replica_retry секунд"""
+        for replica in self.replicas:
+            if replica.pool is pool:
+                replica.retry_at = time.monotonic() + self.replica_retry
+                logger.warning(f"Реплика {replica.host}:{replica.port} недоступна: {error}")
+
+    async def close(self) -> None:
+        """Закрывает пулы (дожидается возврата выданных соединений)"""
+        if self.pool is None:
+            return
+        pools = [self.pool] + [replica.pool for replica in self.replicas if replica.pool]
+        self.pool, self._tables = None, None
+        for replica in self.replicas:
+            replica.pool = None
+        for pool in pools:
+            pool.close()
+            await pool.wait_closed()
+        logger.info("Пул соединений с БД закрыт")
+
+    async def health_check(self, timeout: float = 2.0) -> bool:
+        """
+        Проверяет, что основная БД выдаёт рабочее соединение (SELECT 1 за timeout секунд).
+        Заодно проверяет реплики: неоткрытые переоткрываются, неисправные исключаются из чтения.
+        """
+        await self.open()
+        for replica in self.replicas:
+            if replica.pool is None:
+                await self._open_replica(replica)
+            elif not await self._ping(replica.pool, timeout):
+                self.mark_unhealthy(replica.pool, TimeoutError("SELECT 1"))
+            else:
+                replica.retry_at = 0.0
+        return await self._ping(self.pool, timeout)
+
+    def stats(self) -> dict:
+        """Загруженность пулов: открытые, свободные и занятые соединения"""
+        if self.pool is None:
+            return {"open": False, "minsize": self.minsize, "maxsize": self.maxsize}
+        stats = self._pool_stats(self.pool)
+        stats["pinned"] = time.monotonic() < self._pinned_until
+        stats["replicas"] = [
+            {
+                "host": f"{replica.host}:{replica.port}",
+                "healthy": replica.healthy,
+                **(self._pool_stats(replica.pool) if replica.pool else {"open": False}),
+            }
+            for replica in self.replicas
+        ]
+        return stats
+
+    def _pool_stats(self, pool: aiomysql.Pool) -> dict:
+        size = pool.size
+        free = pool.freesize
+        return {
+            "open": True,
+            "minsize": self.minsize,
+            "maxsize": self.maxsize,
+            "size": size,
+            "free": free,
+            "used": size - free,
+            "utilization": round((size - free) / self.maxsize, 2),
+        }
+
+    async def _create_pool(self, host: str, port: int) -> aiomysql.Pool:
+        return await aiomysql.create_pool(
+            host=host,
+            port=port,
+            user=self.user,
+            password=self.password,
+            db=self.db_name,
+            autocommit=True,
+            minsize=self.minsize,
+            maxsize=self.maxsize,
+            pool_recycle=self.pool_recycle,
+        )
 
-    await sources_table.connect()
-    await internships_table.connect()
-    await employment_types_table.connect()
+    async def _open_replica(self, replica: Replica) -> None:
+        try:
+            replica.pool = await self._create_pool(replica.host, replica.port)
+            replica.retry_at = 0.0
+            logger.info(f"Открыт пул соединений с репликой {replica.host}:{replica.port}")
+        except Exception as e:
+            logger.warning(f"Не удалось подключиться к реплике {replica.host}:{replica.port}: {e}")
+
+    @staticmethod
+    async def _ping(pool: aiomysql.Pool, timeout: float) -> bool:
+        async def ping():
+            async with pool.acquire() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT 1")
+                    await cursor.fetchone()
+
+        try:
+            await asyncio.wait_for(ping(), timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Проверка соединения с БД не прошла: {e}")
+            return False
+
+
+# Общий пул соединений процесса
+database_pool = DatabasePool(
+    config.database.host,
+    config.database.user,
+    config.database.password,
+    config.database.db_name,
+    minsize=config.database.pool_minsize,
+    maxsize=config.database.pool_maxsize,
+    pool_recycle=config.database.pool_recycle,
+    replica_hosts=config.database.replica_hosts,
+    read_pin_seconds=config.database.read_pin_seconds,
+)
 
-    return sources_table, internships_table, employment_types_table
+
+async def initialize_databases() -> tuple:
+    """
+    Возвращает таблицы, работающие через общий пул соединений процесса.
+
+    Пул создаётся при первом вызове (обычно при запуске API или бота),
+    последующие вызовы возвращают те же экземпляры без новых соединений.
+
+    Возвращает:
+        tuple: Кортеж, содержащий экземпляры классов.
+    """
+    return await database_pool.tables()
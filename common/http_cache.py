@@ -0,0 +1,143 @@
+from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """
+    Закэшированный ответ.
+
+    Аргументы:
+        body (Any): Тело ответа (разобранный JSON).
+        etag (Optional[str]): Заголовок ETag ответа.
+        last_modified (Optional[str]): Заголовок Last-Modified ответа.
+        stored_at (float): Время сохранения (unix time).
+    """
+    body: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+    def conditional_headers(self) -> dict:
+        """Заголовки условного запроса для этой записи"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class HttpCache:
+    """
+    Дисковый кэш JSON-ответов для условных запросов (ETag / Last-Modified).
+
+    Аргументы:
+        directory (str): Каталог для файлов кэша.
+        ttl (float): Время жизни записи (сек).
+        max_size (int): Максимальный суммарный размер кэша (байт).
+        evict_every (int): Через сколько записей запускать очистку по размеру.
+    """
+    directory: str = ".cache/http"
+    ttl: float = 7 * 24 * 3600
+    max_size: int = 256 * 1024 * 1024
+    evict_every: int = 200
+    _writes: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        os.makedirs(self.directory, exist_ok=True)
+
+    async def get(self, url: str, params: Optional[dict] = None) -> Optional[CachedResponse]:
+        """Возвращает неистёкшую запись или None"""
+        return await asyncio.to_thread(self._read, self._path(url, params))
+
+    async def set(
+        self,
+        url: str,
+        params: Optional[dict],
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Сохраняет ответ в кэш"""
+        entry = CachedResponse(body, etag, last_modified, time.time())
+        await asyncio.to_thread(self._write, self._path(url, params), entry)
+
+        self._writes += 1
+        if self._writes % self.evict_every == 0:
+            await asyncio.to_thread(self.evict)
+
+    async def touch(self, url: str, params: Optional[dict] = None) -> None:
+        """Продлевает запись после ответа 304 (срок жизни и порядок вытеснения считаются по mtime)"""
+        await asyncio.to_thread(self._touch, self._path(url, params))
+
+    def evict(self) -> None:
+        """Удаляет истёкшие записи и самые старые, пока кэш больше max_size"""
+        now = time.time()
+        files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def _path(self, url: str, params: Optional[dict]) -> str:
+        key = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False, default=str)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _read(self, path: str) -> Optional[CachedResponse]:
+        try:
+            if time.time() - os.stat(path).st_mtime > self.ttl:
+                self._remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                return CachedResponse(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Повреждённая запись кэша {path}: {e}")
+            self._remove(path)
+            return None
+
+    def _write(self, path: str, entry: CachedResponse) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry.__dict__, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from aiohttp_socks import ProxyConnector
+from aiohttp_retry import RetryClient, ExponentialRetry
+
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProxySessionManager:
+    """
+    Хранит по одной keep-alive сессии на каждый прокси на всё время сбора.
+
+    Аргументы:
+        headers (dict): Заголовки, общие для всех запросов сессии.
+        retry_options (ExponentialRetry): Настройки повторов aiohttp_retry.
+        limit (int): Максимум одновременных соединений на одну сессию.
+        limit_per_host (int): Максимум соединений к одному хосту.
+        keepalive_timeout (float): Время жизни простаивающего соединения (сек).
+    """
+    headers: dict = field(default_factory=dict)
+    retry_options: Optional[ExponentialRetry] = None
+    limit: int = 20
+    limit_per_host: int = 10
+    keepalive_timeout: float = 60.0
+    _sessions: Dict[str, RetryClient] = field(default_factory=dict, init=False, repr=False)
+
+    def get_session(self, proxy: str) -> RetryClient:
+        """Возвращает сессию для прокси, создавая её при первом обращении"""
+        session = self._sessions.get(proxy)
+        if session is None:
+            connector = ProxyConnector.from_url(
+                proxy,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            session = RetryClient(
+                connector=connector,
+                headers=self.headers,
+                retry_options=self.retry_options,
+                raise_for_status=False
+            )
+            self._sessions[proxy] = session
+        return session
+
+    async def close(self) -> None:
+        """Закрывает все открытые сессии"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                logger.warning(f"Ошибка закрытия сессии: {e}")
+
+    async def __aenter__(self) -> "ProxySessionManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
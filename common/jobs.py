@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from common.database import database_pool, initialize_databases, Internships
+from common.hh_parser import HHParser
+from common.logger import get_logger
+from common.search_index import refresh_search_index
+from common.trudvsem_parser import TrudVsemParser
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CrawlJob:
+    """
+    Фоновый сбор вакансий со всех источников.
+
+    Аргументы:
+        id (str): Идентификатор задачи.
+        parsers (list): Парсеры источников.
+        purge_days (Optional[int]): Удалить записи, не встречавшиеся столько дней (None - не удалять).
+    """
+    id: str
+    parsers: list
+    purge_days: Optional[int] = None
+    status: str = "pending"      # pending, running, success, failed
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    source_status: Dict[str, str] = field(default_factory=dict)
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("success", "failed")
+
+    async def wait(self) -> "CrawlJob":
+        """Ожидает завершения задачи"""
+        if self.task is not None:
+            await asyncio.shield(self.task)
+        return self
+
+    def as_dict(self) -> dict:
+        """Состояние задачи и прогресс по источникам"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "sources": {
+                parser.source_name: {
+                    "status": self.source_status.get(parser.source_name, "pending"),
+                    **parser.stats.as_dict(),
+                }
+                for parser in self.parsers
+            },
+        }
+
+
+class CrawlJobManager:
+    """
+    Запуск сбора вакансий в фоне.
+
+    В процессе одновременно выполняется не больше одной задачи: повторный запуск
+    возвращает уже идущую. Между процессами (API и бот) источник защищён
+    блокировкой MySQL: если его уже собирает другой процесс, источник пропускается.
+    """
+
+    def __init__(self, max_jobs: int = 50):
+        """
+        Аргументы:
+            max_jobs (int): Сколько последних задач хранить для запроса статуса.
+        """
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, CrawlJob] = {}
+
+    def start(self, purge_days: Optional[int] = None) -> CrawlJob:
+        """
+        Запускает сбор или возвращает уже выполняющуюся задачу.
+
+        Аргументы:
+            purge_days (Optional[int]): После сбора удалить записи, не встречавшиеся столько дней.
+        """
+        running = self.running()
+        if running is not None:
+            return running
+
+        job = CrawlJob(
+            id=uuid.uuid4().hex,
+            parsers=[TrudVsemParser(), HHParser()],
+            purge_days=purge_days
+        )
+        job.task = asyncio.create_task(self._run(job))
+        self._jobs[job.id] = job
+        self._trim()
+        logger.info(f"Запущена задача сбора {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[CrawlJob]:
+        return self._jobs.get(job_id)
+
+    def running(self) -> Optional[CrawlJob]:
+        return next((job for job in self._jobs.values() if not job.done), None)
+
+    async def _run(self, job: CrawlJob) -> None:
+        job.status = "running"
+        try:
+            tables = await initialize_databases()
+            internships_table: Internships = tables[1]
+
+            await asyncio.gather(*(
+                self._run_source(job, parser, internships_table) for parser in job.parsers
+            ))
+
+            if job.purge_days is not None:
+                await internships_table.update_internships(job.purge_days)
+
+            # Пока реплики догоняют, свежие данные читаются из основной БД
+            database_pool.pin_reads()
+            await refresh_search_index(internships_table)
+
+            failed = [name for name, status in job.source_status.items() if status == "failed"]
+            if failed:
+                job.status = "failed"
+                job.error = f"Ошибка сбора: {', '.join(failed)}"
+            else:
+                job.status = "success"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Задача сбора {job.id} завершилась ошибкой: {e}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            logger.info(f"Задача сбора {job.id}: {job.status}")
+
+    async def _run_source(self, job: CrawlJob, parser, internships_table: Internships) -> None:
+        source = parser.source_name
+        async with internships_table.named_lock(f"crawl:{source}") as acquired:
+            if not acquired:
+                job.source_status[source] = "skipped"
+                logger.info(f"Сбор {source} уже выполняется другим процессом, пропуск")
+                return
+
+            job.source_status[source] = "running"
+            try:
+                await parser.get_internships()
+                job.source_status[source] = "success"
+            except Exception as e:
+                job.source_status[source] = "failed"
+                logger.error(f"Ошибка сбора {source}: {e}")
+
+    def _trim(self) -> None:
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in finished[:max(len(self._jobs) - self.max_jobs, 0)]:
+            del self._jobs[job.id]
+
+
+# Задачи сбора процесса (API или бота)
+crawl_jobs = CrawlJobManager()
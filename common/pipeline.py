@@ -0,0 +1,165 @@
+from dataclasses import dataclass, field
+import asyncio
+import random
+import time
+from typing import List, Optional
+
+import aiomysql
+
+from common.database import Internships
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Маркер завершения для задач-писателей
+_STOP = object()
+
+# Ошибки MySQL, после которых пачку можно повторить: lock wait timeout и deadlock
+# (параллельные писатели HH и TrudVsem обновляют одни строки и dataset_meta)
+RETRYABLE_MYSQL_ERRORS = {1205, 1213}
+
+
+def is_retryable(error: Exception) -> bool:
+    return isinstance(error, aiomysql.Error) and bool(error.args) and error.args[0] in RETRYABLE_MYSQL_ERRORS
+
+
+@dataclass
+class CrawlStats:
+    """
+    Счётчики прогресса сбора вакансий одного источника.
+
+    Аргументы:
+        pages (int): Загружено страниц выдачи.
+        vacancies (int): Обработано вакансий.
+        unchanged (int): Пропущено неизменившихся вакансий.
+        written (int): Записано в БД.
+        errors (int): Ошибок загрузки, обработки и записи.
+    """
+    pages: int = 0
+    vacancies: int = 0
+    unchanged: int = 0
+    written: int = 0
+    errors: int = 0
+    started_at: float = field(default_factory=time.monotonic, repr=False)
+
+    def as_dict(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            "pages": self.pages,
+            "vacancies": self.vacancies,
+            "unchanged": self.unchanged,
+            "written": self.written,
+            "errors": self.errors,
+            "elapsed": round(elapsed, 1),
+            "rate": round(self.vacancies / elapsed, 2),
+        }
+
+
+@dataclass
+class InternshipWriter:
+    """
+    Пакетная запись стажировок в БД: парсеры кладут нормализованные записи
+    в ограниченную очередь, задачи-писатели сбрасывают их пачками.
+    Если БД не успевает, put() ждёт свободного места в очереди.
+
+    Аргументы:
+        internships_table (Internships): Таблица для записи.
+        batch_size (int): Размер пачки, при котором запись выполняется сразу.
+        flush_interval (float): Максимальное время ожидания неполной пачки (сек).
+        max_queue_size (int): Ёмкость очереди.
+        workers (int): Количество задач-писателей.
+        stats (Optional[CrawlStats]): Счётчики сбора, в которые добавляются записанные и ошибки.
+        max_retries (int): Сколько раз повторить пачку после deadlock или lock wait timeout.
+        retry_delay (float): Базовая пауза перед повтором (сек), удваивается с каждой попыткой.
+    """
+    internships_table: Internships
+    batch_size: int = 200
+    flush_interval: float = 2.0
+    max_queue_size: int = 1000
+    workers: int = 1
+    stats: Optional[CrawlStats] = None
+    max_retries: int = 3
+    retry_delay: float = 0.5
+    written: int = field(default=0, init=False)
+    failed: int = field(default=0, init=False)
+    _queue: Optional[asyncio.Queue] = field(default=None, init=False, repr=False)
+    _tasks: List[asyncio.Task] = field(default_factory=list, init=False, repr=False)
+
+    async def start(self) -> None:
+        """Запускает задачи-писатели"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def put(self, record: dict) -> None:
+        """Добавляет запись в очередь (ждёт, если очередь заполнена)"""
+        await self._queue.put(record)
+
+    async def close(self) -> None:
+        """Дописывает оставшиеся записи и останавливает писателей"""
+        for _ in self._tasks:
+            await self._queue.put(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        logger.info(f"Записано стажировок: {self.written}, ошибок записи: {self.failed}")
+
+    async def __aenter__(self) -> "InternshipWriter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _worker(self) -> None:
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                record = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch, deadline = [], None
+                continue
+
+            if record is _STOP:
+                await self._flush(batch)
+                return
+
+            batch.append(record)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch, deadline = [], None
+
+    async def _flush(self, batch: list) -> None:
+        if not batch:
+            return
+        for attempt in range(self.max_retries + 1):
+            try:
+                written = await self.internships_table.insert_internships_bulk(batch)
+            except Exception as e:
+                if attempt < self.max_retries and is_retryable(e):
+                    # Транзакция пачки откатилась целиком, повтор безопасен (upsert по source_key);
+                    # случайная добавка разводит повторы конкурирующих писателей
+                    delay = self.retry_delay * 2 ** attempt * (1 + random.random())
+                    logger.warning(
+                        f"Пачка из {len(batch)} стажировок не записана ({e}), "
+                        f"повтор {attempt + 1}/{self.max_retries} через {delay:.1f} с"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                self.failed += len(batch)
+                if self.stats:
+                    self.stats.errors += len(batch)
+                logger.error(f"Ошибка записи пачки из {len(batch)} стажировок: {e}")
+                return
+
+            self.written += written
+            if self.stats:
+                self.stats.written += written
+            return
@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ProxyStats:
+    """
+    Статистика работы одного прокси.
+
+    Аргументы:
+        url (str): Адрес прокси.
+        requests (int): Всего запросов через прокси.
+        failures (int): Всего неудачных запросов.
+        consecutive_failures (int): Неудач подряд (сбрасывается при успехе).
+        latency (float): Скользящее среднее времени ответа (сек).
+        error_rate (float): Скользящая доля ошибок (0..1).
+        cooldown_until (float): Момент (time.monotonic), до которого прокси отключен.
+    """
+    url: str
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency: float = 0.0
+    error_rate: float = 0.0
+    cooldown_until: float = 0.0
+
+    @property
+    def health(self) -> float:
+        """Оценка здоровья прокси: чем меньше ошибок и задержка, тем выше"""
+        return max(1.0 - self.error_rate, 0.01) / (1.0 + self.latency)
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def as_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "latency": round(self.latency, 3),
+            "error_rate": round(self.error_rate, 3),
+            "health": round(self.health, 3),
+            "cooldown": round(max(self.cooldown_until - time.monotonic(), 0.0), 1),
+        }
+
+
+@dataclass
+class ProxyPool:
+    """
+    Пул прокси с выбором по здоровью и отключением (circuit breaking) плохих узлов.
+
+    Аргументы:
+        proxy_urls (List[str]): Адреса прокси.
+        smoothing (float): Коэффициент скользящего среднего для задержки и ошибок.
+        failure_threshold (int): Сколько неудач подряд отправляет прокси в cooldown.
+        base_cooldown (float): Начальная длительность cooldown (сек).
+        max_cooldown (float): Максимальная длительность cooldown (сек).
+    """
+    proxy_urls: List[str]
+    smoothing: float = 0.3
+    failure_threshold: int = 2
+    base_cooldown: float = 5.0
+    max_cooldown: float = 300.0
+    _stats: Dict[str, ProxyStats] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self._stats = {url: ProxyStats(url=url) for url in self.proxy_urls}
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    async def acquire(self) -> str:
+        """
+        Выбирает прокси, взвешивая по здоровью.
+        Если все прокси в cooldown, ждёт ближайшего освобождения.
+        """
+        while True:
+            now = time.monotonic()
+            available = [s for s in self._stats.values() if s.is_available(now)]
+            if available:
+                chosen = random.choices(
+                    available, weights=[s.health for s in available]
+                )[0]
+                return chosen.url
+
+            wait = min(s.cooldown_until for s in self._stats.values()) - now
+            logger.warning(f"Все прокси в cooldown, ожидание {wait:.1f} сек.")
+            await asyncio.sleep(wait)
+
+    def report_success(self, proxy: str, latency: float) -> None:
+        """Учитывает успешный запрос через прокси"""
+        stats = self._stats[proxy]
+        stats.requests += 1
+        stats.consecutive_failures = 0
+        stats.latency = self._smooth(stats.latency, latency, stats.requests)
+        stats.error_rate = self._smooth(stats.error_rate, 0.0, stats.requests)
+
+    def report_failure(
+        self,
+        proxy: str,
+        latency: Optional[float] = None,
+        forbidden: bool = False
+    ) -> None:
+        """
+        Учитывает неудачный запрос через прокси.
+
+        Аргументы:
+            proxy (str): Адрес прокси.
+            latency (Optional[float]): Время до ошибки, если известно.
+            forbidden (bool): Ответ 403 — прокси сразу уходит в cooldown.
+        """
+        stats = self._stats[proxy]
+        stats.requests += 1
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if latency is not None:
+            stats.latency = self._smooth(stats.latency, latency, stats.requests)
+        stats.error_rate = self._smooth(stats.error_rate, 1.0, stats.requests)
+
+        overflow = stats.consecutive_failures - self.failure_threshold
+        if forbidden:
+            overflow = max(overflow, 0)
+        if overflow >= 0:
+            cooldown = min(self.base_cooldown * 2 ** overflow, self.max_cooldown)
+            stats.cooldown_until = time.monotonic() + cooldown
+            logger.warning(f"Прокси {proxy} отключен на {cooldown:.0f} сек.")
+
+    def stats(self) -> List[dict]:
+        """Возвращает статистику по всем прокси"""
+        return [s.as_dict() for s in self._stats.values()]
+
+    def _smooth(self, current: float, value: float, requests: int) -> float:
+        if requests <= 1:
+            return value
+        return current + self.smoothing * (value - current)
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+import pickle
+import time
+from typing import Any, Optional
+
+from common.logger import get_logger
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+
+logger = get_logger(__name__)
+
+
+class MemoryQueryCache:
+    """
+    LRU-кэш результатов запросов в памяти процесса с ограничением по числу записей и TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        """
+        Аргументы:
+            max_entries (int): Максимум записей; самые давно использованные вытесняются.
+            ttl (float): Время жизни записи (сек).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Возвращает неистёкшее значение или None"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class RedisQueryCache:
+    """
+    Общий для нескольких процессов кэш результатов в Redis.
+    Размер ограничивается политикой вытеснения Redis (maxmemory-policy allkeys-lru).
+    Ошибки Redis не прерывают запрос - он просто идёт в БД.
+    """
+
+    def __init__(self, url: str, ttl: float = 60.0, prefix: str = "internships:query:"):
+        """
+        Аргументы:
+            url (str): Адрес Redis (например, redis://localhost:6379/0).
+            ttl (float): Время жизни записи (сек).
+            prefix (str): Префикс ключей.
+        """
+        if redis_asyncio is None:
+            raise RuntimeError("Для QUERY_CACHE=redis установите пакет redis")
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            data = await self._client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Кэш запросов недоступен: {e}")
+            return None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pickle.loads(data)
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self._client.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(self.ttl)))
+        except Exception as e:
+            logger.warning(f"Кэш запросов недоступен: {e}")
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=f"{self.prefix}*"):
+            await self._client.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+def create_query_cache(backend: str, ttl: float = 60.0, max_entries: int = 1024, url: str = ""):
+    """
+    Создаёт кэш результатов по настройке QUERY_CACHE.
+
+    Аргументы:
+        backend (str): 'memory', 'redis' или 'off'.
+        ttl (float): Время жизни записи (сек).
+        max_entries (int): Максимум записей в памяти процесса.
+        url (str): Адрес Redis для backend='redis'.
+
+    Возвращает:
+        MemoryQueryCache | RedisQueryCache | None: Кэш или None, если кэширование выключено.
+    """
+    if backend == "off":
+        return None
+    if backend == "redis":
+        return RedisQueryCache(url, ttl=ttl)
+    return MemoryQueryCache(max_entries=max_entries, ttl=ttl)
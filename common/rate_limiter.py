@@ -0,0 +1,116 @@
+from dataclasses import dataclass, field
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Статусы, при которых источник просит снизить нагрузку
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class AdaptiveRateLimiter:
+    """
+    Token bucket с адаптивной скоростью (AIMD): скорость растёт аддитивно,
+    пока ответы здоровые, и уменьшается мультипликативно на 429/5xx.
+
+    Аргументы:
+        rate (float): Текущая скорость (запросов в секунду).
+        min_rate (float): Нижняя граница скорости.
+        max_rate (float): Верхняя граница скорости.
+        burst (float): Ёмкость корзины (сколько запросов можно выпустить разом).
+        increase (float): Прирост скорости за секунду здоровых ответов.
+        decrease (float): Множитель скорости при перегрузке.
+    """
+    rate: float = 2.0
+    min_rate: float = 0.2
+    max_rate: float = 20.0
+    burst: float = 5.0
+    increase: float = 0.5
+    decrease: float = 0.5
+    _tokens: float = field(default=0.0, init=False, repr=False)
+    _updated_at: float = field(default_factory=time.monotonic, init=False, repr=False)
+    _decreased_at: float = field(default=0.0, init=False, repr=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        self._tokens = min(self.burst, self.rate)
+
+    async def acquire(self) -> None:
+        """Ожидает свободный токен"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def feedback(self, status: Optional[int]) -> None:
+        """
+        Подстраивает скорость по результату запроса.
+
+        Аргументы:
+            status (Optional[int]): HTTP-статус ответа или None при таймауте.
+        """
+        if status is None or status in THROTTLE_STATUSES:
+            self.on_throttle()
+        elif status < 400:
+            self.on_success()
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        # Пачка отказов на одной скорости снижает её один раз
+        if now - self._decreased_at < 1 / self.rate:
+            return
+        self._decreased_at = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"Снижение скорости запросов до {self.rate:.2f} запр/сек")
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+
+class RateLimiterRegistry:
+    """Набор ограничителей скорости по ключу (источник, прокси)."""
+
+    def __init__(self, **defaults):
+        """
+        Аргументы:
+            defaults: Параметры AdaptiveRateLimiter для новых ограничителей.
+        """
+        self.defaults = defaults
+        self._limiters: Dict[Tuple[str, Optional[str]], AdaptiveRateLimiter] = {}
+
+    def get(self, source: str, proxy: Optional[str] = None, **overrides) -> AdaptiveRateLimiter:
+        """Возвращает ограничитель источника (и прокси), создавая его при первом обращении"""
+        key = (source, proxy)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(**{**self.defaults, **overrides})
+            self._limiters[key] = limiter
+        return limiter
+
+    def stats(self) -> List[dict]:
+        """Текущая скорость каждого ограничителя"""
+        return [
+            {"source": source, "proxy": proxy, "rate": round(limiter.rate, 2)}
+            for (source, proxy), limiter in self._limiters.items()
+        ]
+
+
+# Общий реестр ограничителей для всех парсеров процесса
+rate_limiters = RateLimiterRegistry()
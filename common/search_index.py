@@ -0,0 +1,314 @@
+from array import array
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from common.database import config, Internships, INTERNSHIP_COLUMNS
+from common.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Колонки, по которым ищут ключевые слова (как в LIKE-режиме Internships)
+TEXT_COLUMNS = ('profession', 'title', 'company_name', 'source_name', 'description')
+
+_COLUMN_IDX = {name: idx for idx, name in enumerate(INTERNSHIP_COLUMNS)}
+
+
+def tokenize(text: str) -> Set[str]:
+    """Разбивает текст на слова в нижнем регистре"""
+    return set(TOKEN_RE.findall(text.lower())) if text else set()
+
+
+def _first(value):
+    """Фильтры API и бота приходят списками - берём первое значение"""
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+class InternshipSearchIndex:
+    """
+    Инвертированный индекс стажировок в памяти процесса.
+
+    Слова текстовых колонок хранятся в posting-списках, зарплаты - в числовых
+    массивах, источники и типы занятости - в битовых масках по позициям записей.
+    Обновляется инкрементально по last_seen_at; version - версия данных (dataset_meta),
+    на которой построен индекс. Internships отдаёт поиск индексу, только пока она
+    совпадает с текущей, иначе запускает обновление в фоне и ищет в SQL.
+    """
+
+    def __init__(self, compact_ratio: float = 0.5, overlap: float = 300.0):
+        """
+        Аргументы:
+            compact_ratio (float): Доля удалённых позиций, после которой индекс уплотняется.
+            overlap (float): На сколько секунд каждое обновление перечитывает записи до прошлого
+                watermark. last_seen_at получает время начала запроса записи, а видна строка
+                становится только после фиксации пачки - без перекрытия такие строки терялись бы.
+        """
+        self.compact_ratio = compact_ratio
+        self.overlap = timedelta(seconds=overlap)
+        self.ready = False
+        self.version: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._watermark: Optional[datetime] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rows: List[Optional[tuple]] = []          # позиция -> строка (None - удалена)
+        self._texts: List[str] = []                     # позиция -> текст для проверки фраз
+        self._tokens: List[Set[str]] = []               # позиция -> слова записи
+        self._positions: Dict[int, int] = {}            # id -> позиция
+        self._postings: Dict[str, Set[int]] = {}        # слово -> позиции
+        self._salary_from = array('d')
+        self._salary_to = array('d')
+        self._sources: Dict[str, int] = {}              # источник -> битовая маска позиций
+        self._employment: Dict[str, int] = {}           # тип занятости -> битовая маска позиций
+        self._expansions: Dict[str, Set[int]] = {}      # кэш раскрытия подстрок по словарю
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    async def refresh(self, internships_table: Internships) -> None:
+        """
+        Догружает записи, изменившиеся с прошлого обновления, и убирает удалённые.
+        Первый вызов строит индекс целиком.
+        """
+        async with self._lock:
+            # Версия читается до выборки: данные индекса будут не старее неё
+            version = await internships_table.dataset_version()
+            # Перечитанные записи без изменений пропускаются сравнением строк ниже
+            since = self._watermark - self.overlap if self._watermark is not None else None
+            watermark, rows = await internships_table.select_internships_for_index(since)
+
+            if since is not None:
+                alive_ids = set(await internships_table.select_internship_ids())
+                for internship_id in list(self._positions):
+                    if internship_id not in alive_ids:
+                        self._remove(internship_id)
+
+            for row in rows:
+                pos = self._positions.get(row[_COLUMN_IDX['id']])
+                # Запись только отмечена как встреченная - переиндексация не нужна
+                if pos is not None and self._rows[pos] == row:
+                    continue
+                self._remove(row[_COLUMN_IDX['id']])
+                self._add(row)
+
+            if len(self._rows) and 1 - len(self._positions) / len(self._rows) > self.compact_ratio:
+                self._compact()
+
+            self._expansions.clear()
+            self._watermark = watermark
+            self.version = version
+            self.ready = True
+
+        logger.info(f"Поисковый индекс обновлён: {len(rows)} записей, всего {len(self)}")
+
+    def refresh_in_background(self, internships_table: Internships) -> None:
+        """Запускает refresh в фоне, если обновление ещё не выполняется"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_logged(internships_table))
+
+    async def _refresh_logged(self, internships_table: Internships) -> None:
+        try:
+            await self.refresh(internships_table)
+        except Exception as e:
+            logger.error(f"Ошибка обновления поискового индекса: {e}")
+
+    def search(
+        self,
+        include: List[str],
+        exclude: List[str],
+        salary_from=None,
+        salary_to=None,
+        employment_type=None,
+        source_name=None,
+        limit: int = 100,
+        offset: int = 0,
+        after_id: Optional[int] = None
+    ) -> List[tuple]:
+        """
+        Ищет записи: любое из include и ни одного из exclude (подстроки, как LIKE '%...%').
+
+        Возвращает:
+            List[tuple]: Строки в формате INTERNSHIP_COLUMNS, отсортированные по id.
+        """
+        candidates = self._candidates(
+            include, exclude, salary_from, salary_to, employment_type, source_name
+        )
+        rows = sorted(
+            (self._rows[pos] for pos in candidates),
+            key=lambda row: row[_COLUMN_IDX['id']]
+        )
+        if after_id is not None:
+            rows = [row for row in rows if row[_COLUMN_IDX['id']] > after_id]
+        return rows[offset:offset + limit]
+
+    def count(
+        self,
+        include: List[str],
+        exclude: List[str],
+        salary_from=None,
+        salary_to=None,
+        employment_type=None,
+        source_name=None
+    ) -> int:
+        """Количество записей, которые вернул бы search без ограничений."""
+        return len(self._candidates(
+            include, exclude, salary_from, salary_to, employment_type, source_name
+        ))
+
+    def _candidates(
+        self,
+        include: List[str],
+        exclude: List[str],
+        salary_from,
+        salary_to,
+        employment_type,
+        source_name
+    ) -> Set[int]:
+        if include:
+            candidates = set()
+            for word in include:
+                candidates |= self._match(word)
+        else:
+            candidates = set(self._positions.values())
+
+        for word in exclude:
+            candidates -= self._match(word)
+
+        if employment_type:
+            patterns = [employment_type] if isinstance(employment_type, str) else employment_type
+            patterns = [p.strip().lower() for p in patterns if p.strip()]
+            mask = 0
+            for name, bits in self._employment.items():
+                if any(p in name for p in patterns):
+                    mask |= bits
+            candidates = {pos for pos in candidates if (mask >> pos) & 1}
+
+        if source_name:
+            sources = [source_name] if isinstance(source_name, str) else source_name
+            mask = 0
+            for source in sources:
+                mask |= self._sources.get(source.strip(), 0)
+            candidates = {pos for pos in candidates if (mask >> pos) & 1}
+
+        salary_from = _first(salary_from)
+        if salary_from is not None:
+            low = float(salary_from)
+            candidates = {pos for pos in candidates if self._salary_from[pos] >= low}
+
+        salary_to = _first(salary_to)
+        if salary_to is not None:
+            high = float(salary_to)
+            candidates = {pos for pos in candidates if self._salary_to[pos] <= high}
+
+        return candidates
+
+    def _match(self, word: str) -> Set[int]:
+        """Позиции записей, в тексте которых встречается слово или фраза"""
+        word = word.strip().lower()
+        tokens = TOKEN_RE.findall(word)
+
+        if len(tokens) == 1 and tokens[0] == word:
+            return self._expand(word)
+
+        # Фраза или слово со спецсимволами: кандидаты по словам, затем проверка подстроки
+        if tokens:
+            candidates = set.intersection(*(self._expand(token) for token in tokens))
+        else:
+            candidates = set(self._positions.values())
+        return {pos for pos in candidates if word in self._texts[pos]}
+
+    def _expand(self, fragment: str) -> Set[int]:
+        """Объединение posting-списков всех слов словаря, содержащих фрагмент"""
+        positions = self._expansions.get(fragment)
+        if positions is None:
+            positions = set()
+            for token, postings in self._postings.items():
+                if fragment in token:
+                    positions |= postings
+            self._expansions[fragment] = positions
+        return positions
+
+    def _add(self, row: tuple) -> None:
+        pos = len(self._rows)
+        self._rows.append(row)
+        self._positions[row[_COLUMN_IDX['id']]] = pos
+
+        texts = [str(row[_COLUMN_IDX[column]] or '') for column in TEXT_COLUMNS]
+        tokens = tokenize(" ".join(texts))
+        self._texts.append("\n".join(texts).lower())
+        self._tokens.append(tokens)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(pos)
+
+        salary_from = row[_COLUMN_IDX['salary_from']]
+        salary_to = row[_COLUMN_IDX['salary_to']]
+        self._salary_from.append(float(salary_from) if salary_from is not None else float('nan'))
+        self._salary_to.append(float(salary_to) if salary_to is not None else float('nan'))
+
+        bit = 1 << pos
+        source = row[_COLUMN_IDX['source_name']]
+        self._sources[source] = self._sources.get(source, 0) | bit
+        for key in self._employment_keys(row):
+            self._employment[key] = self._employment.get(key, 0) | bit
+
+    def _remove(self, internship_id: int) -> None:
+        pos = self._positions.pop(internship_id, None)
+        if pos is None:
+            return
+
+        row = self._rows[pos]
+        for token in self._tokens[pos]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(pos)
+                if not postings:
+                    del self._postings[token]
+
+        bit = ~(1 << pos)
+        source = row[_COLUMN_IDX['source_name']]
+        self._sources[source] &= bit
+        for key in self._employment_keys(row):
+            self._employment[key] &= bit
+
+        self._rows[pos] = None
+        self._texts[pos] = ''
+        self._tokens[pos] = set()
+
+    @staticmethod
+    def _employment_keys(row: tuple) -> List[str]:
+        return [
+            name.lower()
+            for name in (row[_COLUMN_IDX['employment_types']] or '').split(', ')
+            if name
+        ]
+
+    def _compact(self) -> None:
+        rows = [row for row in self._rows if row is not None]
+        self._reset()
+        for row in rows:
+            self._add(row)
+
+
+# Индекс процесса; используется, если DB_KEYWORD_SEARCH=index
+search_index = InternshipSearchIndex()
+
+
+async def refresh_search_index(internships_table: Internships) -> None:
+    """Подключает индекс как бэкенд поиска по ключевым словам и обновляет его"""
+    if config.database.keyword_search != 'index':
+        return
+
+    Internships.search_backend = search_index
+    try:
+        await search_index.refresh(internships_table)
+    except Exception as e:
+        logger.error(f"Ошибка обновления поискового индекса: {e}")
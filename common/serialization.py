@@ -0,0 +1,87 @@
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+import json
+from typing import Any, Iterable, Sequence
+
+from common.database import INTERNSHIP_COLUMNS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _number(value):
+    """Decimal из БД -> int для целых значений, иначе float"""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value if isinstance(value, str) else str(value)
+
+
+_NUMERIC_COLUMNS = {'id', 'salary_from', 'salary_to'}
+
+
+@lru_cache(maxsize=64)
+def _converters(columns: tuple[str, ...]) -> tuple:
+    """Преобразование значения для каждой из колонок"""
+    return tuple(_number if column in _NUMERIC_COLUMNS else _text for column in columns)
+
+
+def row_to_item(row: tuple, columns: Sequence[str] = INTERNSHIP_COLUMNS) -> dict:
+    """
+    Преобразует строку выборки в словарь ответа:
+    id и зарплаты - числа (null, если не указаны), остальное - строки.
+
+    Аргументы:
+        row (tuple): Строка выборки.
+        columns (Sequence[str]): Колонки строки (по умолчанию INTERNSHIP_COLUMNS).
+    """
+    columns = tuple(columns)
+    return {
+        column: convert(value)
+        for column, convert, value in zip(columns, _converters(columns), row)
+    }
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return _number(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Сериализует данные в JSON (UTF-8). Использует orjson, если он установлен.
+
+    Аргументы:
+        data (Any): Данные для сериализации.
+        indent (bool): Форматировать с отступами (для файлов, которые читает человек).
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, default=_default, option=option)
+    return json.dumps(
+        data, ensure_ascii=False, default=_default, indent=2 if indent else None
+    ).encode("utf-8")
+
+
+def dumps_rows(
+    rows: Iterable[tuple],
+    indent: bool = False,
+    columns: Sequence[str] = INTERNSHIP_COLUMNS
+) -> bytes:
+    """Сериализует строки выборки в JSON-массив словарей"""
+    return dumps([row_to_item(row, columns) for row in rows], indent=indent)
@@ -1,10 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import aiohttp
 import asyncio
 from typing import Optional
 
-from common.database import initialize_databases, Internships
+from common.database import initialize_databases
+from common.http_cache import HttpCache
 from common.logger import get_logger
+from common.pipeline import CrawlStats, InternshipWriter
+from common.rate_limiter import RateLimiterRegistry, rate_limiters
 
 
 logger = get_logger(__name__)
@@ -15,7 +18,11 @@ class TrudVsemParser:
     url: str = "http://opendata.trudvsem.ru/api/v1/vacancies/region/6600000000000"    # 6600000000000 - Екатеринбург
     source_name: str = "trudvsem.ru"
     per_page: int = 100
-    base_delay: float = 1.2
+    rate_limits: RateLimiterRegistry = field(default_factory=lambda: rate_limiters)
+    cache: Optional[HttpCache] = field(default_factory=HttpCache)
+    db_writers: int = 1                  # Задач, пишущих в БД
+    write_batch_size: int = 200          # Размер пачки записи в БД
+    stats: CrawlStats = field(default_factory=CrawlStats)
 
     async def fetch_vacancies(
         self,
@@ -29,37 +36,59 @@ class TrudVsemParser:
             "limit": self.per_page
         }
 
+        cached = await self.cache.get(self.url, params) if self.cache else None
+        conditional_headers = cached.conditional_headers() if cached else None
+
+        # Паузу между попытками задаёт ограничитель: на 429/5xx он снижает скорость
+        limiter = self.rate_limits.get(self.source_name)
         for attempt in range(3):
+            await limiter.acquire()
             try:
                 async with session.get(
                     self.url,
                     params=params,
+                    headers=conditional_headers,
                     timeout=aiohttp.ClientTimeout(total=10)
                 ) as response:
+                    limiter.feedback(response.status)
+
+                    if response.status == 304 and cached:
+                        self.stats.pages += 1
+                        logger.info(f"Страница {page + 1} не изменилась, взята из кэша")
+                        await self.cache.touch(self.url, params)
+                        return cached.body
 
                     if response.status == 200:
                         logger.info(f"Успешно загружена страница {page + 1}")
-                        return await response.json()
+                        data = await response.json()
+                        self.stats.pages += 1
+                        if self.cache:
+                            await self.cache.set(
+                                self.url, params, data,
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified")
+                            )
+                        return data
 
                     logger.warning(
                         f"Ошибка {response.status} при загрузке страницы {page + 1} "
                         f"(попытка {attempt+1}/3)"
                     )
-                    await asyncio.sleep(self.base_delay * (attempt + 1))
 
             except Exception as e:
+                limiter.feedback(None)
                 logger.error(f"Ошибка подключения: {str(e)}")
-                await asyncio.sleep(self.base_delay * 2)
 
+        self.stats.errors += 1
         logger.error(f"Не удалось загрузить страницу {page+1} после 3 попыток")
         return None
 
     async def process_vacancy(
         self,
         vacancy: dict,
-        internships_table: Internships
+        writer: InternshipWriter
     ):
-        """Обработка и сохранение вакансии"""
+        """Обработка вакансии и передача записи писателю БД"""
         try:
             vacancy_data = vacancy.get("vacancy", {})
             company_data = vacancy_data.get("company", {})
@@ -72,33 +101,46 @@ class TrudVsemParser:
             salary_from = vacancy_data.get("salary_min", 0) or 0
             salary_to = vacancy_data.get("salary_max", 0) or 0
 
-            await internships_table.insert_internship(
-                title=title,
-                profession=title,
-                company_name=company,
-                salary_from=float(salary_from),
-                salary_to=float(salary_to),
-                employment=vacancy_data.get("employment", ""),
-                source_name=self.source_name,
-                link=link,
-                description=vacancy_data.get("duty", "")
-            )
+            await writer.put({
+                "title": title,
+                "profession": title,
+                "company_name": company,
+                "salary_from": float(salary_from),
+                "salary_to": float(salary_to),
+                "employment": vacancy_data.get("employment", ""),
+                "source_name": self.source_name,
+                "link": link,
+                "description": vacancy_data.get("duty", ""),
+                "external_id": vacancy_data.get("id"),
+            })
+            self.stats.vacancies += 1
 
             logger.info(f"Успешно обработана вакансия: {title[:50]}...")
 
         except KeyError as e:
+            self.stats.errors += 1
             logger.error(f"Отсутствует обязательное поле: {str(e)}")
         except ValueError as e:
+            self.stats.errors += 1
             logger.error(f"Ошибка преобразования данных: {str(e)}")
         except Exception as e:
+            self.stats.errors += 1
             logger.error(f"Ошибка обработки вакансии: {str(e)}")
 
     async def get_internships(self):
         """Основной метод сбора данных"""
         tables = await initialize_databases()
         internships_table = tables[1]
+        self.stats = CrawlStats()
 
-        async with aiohttp.ClientSession() as session:
+        writer = InternshipWriter(
+            internships_table,
+            batch_size=self.write_batch_size,
+            workers=self.db_writers,
+            stats=self.stats
+        )
+
+        async with aiohttp.ClientSession() as session, writer:
             page = 0
             while True:
                 logger.info(f"Обработка страницы {page + 1}")
@@ -113,15 +155,9 @@ class TrudVsemParser:
 
                 logger.info(f"Найдено {len(vacancies)} вакансий на странице {page + 1}")
 
-                # Обработка с вакансий
-                batch_size = 5
-                for i in range(0, len(vacancies), batch_size):
-                    batch = vacancies[i:i+batch_size]
-                    tasks = [self.process_vacancy(v, internships_table) for v in batch]
-                    await asyncio.gather(*tasks)
-
-                    if i + batch_size < len(vacancies):
-                        await asyncio.sleep(self.base_delay)
+                # Обработка с вакансий (без HTTP-запросов, поэтому без пауз)
+                tasks = [self.process_vacancy(v, writer) for v in vacancies]
+                await asyncio.gather(*tasks)
 
                 # Проверка пагинации
                 if (page + 1) * self.per_page >= total:
@@ -12,6 +12,7 @@ DROP TABLE IF EXISTS internship_employment;  -- Связующая таблиц
 DROP TABLE IF EXISTS internships;            -- Основная таблица стажировок
 DROP TABLE IF EXISTS employment_types;       -- Таблица типов занятости
 DROP TABLE IF EXISTS sources;                -- Таблица источников вакансий
+DROP TABLE IF EXISTS dataset_meta;           -- Версия данных
 
 -- Включаем проверку внешних ключей после завершения операций удаления
 SET FOREIGN_KEY_CHECKS = 1;
@@ -50,6 +51,15 @@ CREATE TABLE internships (
     link TEXT NOT NULL,                      -- Ссылка на вакансию
     description TEXT,                        -- Полное описание вакансии
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,          -- Дата создания записи
+    external_id VARCHAR(64),                 -- ID вакансии на сайте-источнике
+    external_updated_at DATETIME,            -- Время обновления вакансии на источнике (UTC)
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,        -- Когда вакансия последний раз встречалась в выдаче
+    source_key BINARY(32) NOT NULL,          -- SHA-256 от (источник, ID вакансии или ссылка)
+    employment_mask BIGINT UNSIGNED NOT NULL DEFAULT 0,      -- Типы занятости битами (бит id - 1, для id до 64)
+    employment_names VARCHAR(255),           -- Типы занятости для вывода (копия из employment_types)
+    UNIQUE KEY uq_source_key (source_key),   -- Одна запись на вакансию источника
+    INDEX idx_source_external (source_name, external_id),    -- Поиск уже сохранённых вакансий источника
+    FULLTEXT INDEX ft_internships_text (title, profession, company_name, description) WITH PARSER ngram,  -- Поиск по ключевым словам
     FOREIGN KEY (source_name) REFERENCES sources(source_name)  -- Связь с источниками
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -65,6 +75,18 @@ CREATE TABLE internship_employment (
     FOREIGN KEY (employment_id) REFERENCES employment_types(id)                -- Связь с типами занятости
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+/*
+ * Версия данных стажировок
+ * Увеличивается после сбора вакансий и очистки устаревших, сбрасывает кэш результатов запросов
+ */
+CREATE TABLE dataset_meta (
+    id TINYINT PRIMARY KEY,                  -- Всегда 1
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,              -- Номер версии
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP  -- Время последнего изменения
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+INSERT IGNORE INTO dataset_meta (id, version) VALUES (1, 0);
+
 /*
  * Начальное заполнение таблицы источников
  * Используем INSERT IGNORE для предотвращения дубликатов
@@ -0,0 +1,55 @@
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.compression import CompressionMiddleware, strip_encoding
+
+
+ETAG = '"abc123"'
+BODY = b'{"data": [' + b'{"title": "Python"},' * 200 + b'{}]}'
+
+
+async def internships(request: Request) -> Response:
+    tags = [strip_encoding(tag.strip()) for tag in request.headers.get("if-none-match", "").split(",")]
+    if ETAG in tags:
+        return Response(status_code=304, headers={"ETag": ETAG})
+    return Response(BODY, media_type="application/json", headers={"ETag": ETAG})
+
+
+def make_client() -> TestClient:
+    app = Starlette(routes=[Route("/internships", internships)])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_gzip_304_keeps_encoded_etag_and_vary():
+    client = make_client()
+
+    response = client.get("/internships", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc123-gzip"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.content == BODY
+
+    revalidated = client.get("/internships", headers={
+        "Accept-Encoding": "gzip",
+        "If-None-Match": response.headers["etag"],
+    })
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == response.headers["etag"]
+    assert "Accept-Encoding" in revalidated.headers["vary"]
+    assert "content-encoding" not in revalidated.headers
+
+
+def test_304_for_identity_etag_is_unchanged():
+    client = make_client()
+
+    revalidated = client.get("/internships", headers={
+        "Accept-Encoding": "gzip",
+        "If-None-Match": ETAG,
+    })
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == ETAG